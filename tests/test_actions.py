@@ -0,0 +1,64 @@
+from threadspy.actions import CANCELLED, COALESCED, DONE, FAILED, SKIPPED, ActionQueue
+from threadspy.models import FriendshipStatus, FriendshipStatusResponse, ThreadsUser
+
+class FakeApi:
+    def __init__(self):
+        self.calls = []
+
+    def follow_user(self, user_id):
+        self.calls.append(('follow_user', user_id))
+        return FriendshipStatusResponse.from_dict({'status': 'ok', 'friendship_status': {'following': True}})
+
+    def unfollow_user(self, user_id):
+        self.calls.append(('unfollow_user', user_id))
+        return FriendshipStatusResponse.from_dict({'status': 'ok'})
+
+    def like(self, thread_id):
+        self.calls.append(('like', thread_id))
+        if thread_id == 'broken':
+            raise ValueError('nope')
+        return True
+
+def test_queue_coalesces_cancels_and_skips():
+    api = FakeApi()
+    queue = ActionQueue(api, requests_per_minute=6000)
+    already_following = ThreadsUser.from_dict({'pk': 3, 'friendship_status': {'following': True}})
+
+    outcomes = [
+        queue.add('follow_user', 1),
+        queue.add('follow_user', 1),
+        queue.add('follow_user', 2),
+        queue.add('unfollow_user', 2),
+        queue.add('follow_user', already_following),
+        queue.add('unfollow_user', 4, status=FriendshipStatus.from_dict({'following': True})),
+        queue.add('like', 'good'),
+        queue.add('like', 'broken'),
+    ]
+    assert len(queue) == 6
+
+    assert queue.run() == outcomes
+    assert [outcome.status for outcome in outcomes] == [
+        DONE, COALESCED, CANCELLED, DONE, SKIPPED, DONE, DONE, FAILED,
+    ]
+    assert isinstance(outcomes[-1].error, ValueError)
+    assert sorted(api.calls) == [
+        ('follow_user', 1), ('like', 'broken'), ('like', 'good'), ('unfollow_user', 2), ('unfollow_user', 4),
+    ]
+    assert len(queue) == 0
+
+def test_last_opposite_action_wins():
+    api = FakeApi()
+    queue = ActionQueue(api, requests_per_minute=6000)
+    following = FriendshipStatus.from_dict({'following': True})
+    not_following = FriendshipStatus.from_dict({'following': False})
+
+    outcomes = [
+        queue.add('follow_user', 5, status=following),
+        queue.add('unfollow_user', 5),
+        queue.add('follow_user', 6, status=not_following),
+        queue.add('unfollow_user', 6),
+    ]
+    queue.run()
+
+    assert [outcome.status for outcome in outcomes] == [CANCELLED, DONE, CANCELLED, SKIPPED]
+    assert api.calls == [('unfollow_user', 5)]
@@ -0,0 +1,44 @@
+from threadspy.history import ProfileHistory
+from threadspy.models import ThreadsUser
+
+def make_user(follower_count, biography='hello', links=()):
+    return ThreadsUser.from_dict({
+        'pk': 314216,
+        'follower_count': follower_count,
+        'biography': biography,
+        'is_verified': True,
+        'bio_links': [{'url': url} for url in links],
+    })
+
+def test_history_stores_only_deltas(tmp_path):
+    history = ProfileHistory(str(tmp_path))
+
+    assert history.record(make_user(10), timestamp=1) == {
+        'follower_count': 10, 'biography': 'hello', 'is_verified': True, 'bio_links': [],
+    }
+    assert history.record(make_user(10), timestamp=2) == {}
+    assert history.record(make_user(12), timestamp=3) == {'follower_count': 12}
+    assert history.record(make_user(12, links=['https://a.b']), timestamp=4) == {'bio_links': ['https://a.b']}
+
+    assert len((tmp_path / '314216.jsonl').read_text().splitlines()) == 3
+
+def test_history_range_queries_survive_reload(tmp_path):
+    history = ProfileHistory(str(tmp_path))
+    for timestamp, count in enumerate([10, 11, 11, 15, 20]):
+        history.record(make_user(count), timestamp=timestamp)
+
+    reloaded = ProfileHistory(str(tmp_path))
+    assert reloaded.field_history(314216, 'follower_count', start=1, end=3) == [(1, 11), (3, 15)]
+    assert reloaded.state_at(314216, 3.5)['follower_count'] == 15
+    assert reloaded.latest(314216)['follower_count'] == 20
+    assert reloaded.changes(314216, start=10) == []
+
+def test_history_shared_between_instances(tmp_path):
+    first = ProfileHistory(str(tmp_path))
+    second = ProfileHistory(str(tmp_path))
+    first.record(make_user(10), timestamp=1)
+    second.record(make_user(11), timestamp=2)
+    first.record(make_user(12), timestamp=3)
+    second.record(make_user(13), timestamp=4)
+
+    assert ProfileHistory(str(tmp_path)).field_history(314216, 'follower_count') == [(1, 10), (2, 11), (3, 12), (4, 13)]
@@ -0,0 +1,30 @@
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ('instagrapi', 'cryptography')
+
+def import_profile(module: str) -> dict:
+    code = (
+        'import json, sys, time\n'
+        'start = time.perf_counter()\n'
+        f'import {module}\n'
+        'elapsed = time.perf_counter() - start\n'
+        f'print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n'
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=root)
+    return json.loads(output)
+
+def best_import_time(module: str, runs: int = 3) -> float:
+    return min(import_profile(module)['elapsed'] for _ in range(runs))
+
+def test_client_import_skips_login_dependencies():
+    assert import_profile('threadspy.client')['loaded'] == []
+
+def test_client_import_time():
+    # requests is a hard dependency, everything threadspy adds on top must stay cheap
+    overhead = best_import_time('threadspy.client') - best_import_time('requests')
+    print(f'threadspy.client import overhead: {overhead * 1000:.1f} ms')
+    assert overhead < 0.25
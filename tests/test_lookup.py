@@ -0,0 +1,48 @@
+import time
+
+from threadspy.auth import MemoryTokenStore
+from threadspy.client import ThreadsApi
+from threadspy.models import Thread, ThreadsUser
+
+STAGE_LATENCY = 0.05
+
+def make_api():
+    api = ThreadsApi(settings_file='', token_store=MemoryTokenStore())
+
+    def get_user_id(username):
+        time.sleep(STAGE_LATENCY)
+        if username == 'ghost':
+            raise AttributeError('no user_id in page')
+        return int(username[4:])
+
+    def get_user_profile(user_id):
+        time.sleep(STAGE_LATENCY)
+        return ThreadsUser.from_dict({'pk': user_id, 'username': f'user{user_id}'})
+
+    def get_user_threads_auth(user_id):
+        time.sleep(STAGE_LATENCY)
+        return [Thread.from_dict({'id': str(user_id)})]
+
+    api.get_user_id = get_user_id
+    api.get_user_profile = get_user_profile
+    api.get_user_threads_auth = get_user_threads_auth
+    return api
+
+def test_lookup_stages_overlap():
+    usernames = [f'user{i}' for i in range(12)] + ['ghost']
+
+    started = time.time()
+    results = {lookup.username: lookup for lookup in make_api().lookup_users(usernames, max_workers=8)}
+    elapsed = time.time() - started
+
+    # 13 users x 3 stages one after another would take about 2 s
+    assert elapsed < 13 * 3 * STAGE_LATENCY / 3
+    assert sorted(results) == sorted(usernames)
+    assert results['user5'].user_id == 5
+    assert results['user5'].profile.username == 'user5'
+    assert results['user5'].threads[0].id == '5'
+    assert isinstance(results['ghost'].error, AttributeError) and results['ghost'].profile is None
+
+def test_lookup_without_threads():
+    lookups = list(make_api().lookup_users(['user1'], threads=False))
+    assert lookups[0].profile.pk == 1 and lookups[0].threads is None
@@ -0,0 +1,61 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from threadspy.media import MediaDownloader, best_candidate
+from threadspy.models import Candidate, ThreadsUser
+
+class ImageHandler(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):
+        self.hits.append(self.path)
+        body = b'same-bytes' if self.path.startswith('/avatar') else b'other-bytes'
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def image_server():
+    ImageHandler.hits = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ImageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+def test_best_candidate_respects_policy():
+    candidates = [Candidate(height=h, width=h, url=f'u{h}') for h in (150, 640, 1080)]
+
+    assert best_candidate(candidates).url == 'u1080'
+    assert best_candidate(candidates, max_width=700).url == 'u640'
+    assert best_candidate(candidates, max_pixels=100).url == 'u150'
+
+def test_downloads_are_deduplicated(tmp_path, image_server):
+    with MediaDownloader(str(tmp_path), max_workers=4) as downloader:
+        paths = downloader.download_many([
+            f'{image_server}/avatar/1.jpg?stp=s150x150&oh=a&_nc_ht=x',
+            f'{image_server}/avatar/2.jpg',
+            f'{image_server}/post.jpg',
+        ])
+        assert len(set(paths.values())) == 2
+        assert open(paths[f'{image_server}/post.jpg'], 'rb').read() == b'other-bytes'
+
+        # Same path with a different CDN signature is served from the URL cache
+        assert downloader.download(f'{image_server}/avatar/1.jpg?stp=s150x150&oh=b&oe=c') == paths[f'{image_server}/avatar/1.jpg?stp=s150x150&oh=a&_nc_ht=x']
+        # A different rendition of the same path is a different file
+        downloader.download(f'{image_server}/avatar/1.jpg?stp=s320x320&oh=a')
+    assert len(ImageHandler.hits) == 4
+
+    with MediaDownloader(str(tmp_path)) as downloader:
+        user = ThreadsUser.from_dict({
+            'hd_profile_pic_versions': [{'url': f'{image_server}/avatar/2.jpg', 'width': 320, 'height': 320}],
+        })
+        assert downloader.download_profile_picture(user) == paths[f'{image_server}/avatar/2.jpg']
+    assert len(ImageHandler.hits) == 4
@@ -0,0 +1,78 @@
+import pytest
+
+from threadspy.exceptions import ChallengeRequiredError, LoginRequiredError, NoHealthyAccountError, RateLimitedError
+from threadspy.pool import AccountPool
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = AccountPool(requests_per_minute=6000)
+    for username in ('alice', 'bob'):
+        account = pool.add_account(
+            username, 'secret',
+            token_path=str(tmp_path / f'{username}.bin'),
+            settings_file=str(tmp_path / f'{username}.json'),
+        )
+        account.api.is_logged_in = True
+    return pool
+
+def test_reads_move_away_from_throttled_accounts(pool):
+    calls = []
+
+    def throttled(user_id):
+        calls.append('alice')
+        raise RateLimitedError('Please wait a few minutes before you try again.')
+
+    pool.accounts['alice'].api.get_user_profile = throttled
+    pool.accounts['bob'].api.get_user_profile = lambda user_id: calls.append('bob') or user_id
+
+    assert pool.get_user_profile(1) == 1
+    assert pool.get_user_profile(2) == 2
+    assert calls == ['alice', 'bob', 'bob']
+    assert not pool.accounts['alice'].healthy
+
+def test_challenged_accounts_leave_rotation(pool):
+    def challenged(user_id):
+        raise ChallengeRequiredError('challenge_required')
+
+    for account in pool.accounts.values():
+        account.api.get_user_profile = challenged
+
+    with pytest.raises(NoHealthyAccountError):
+        pool.get_user_profile(1)
+    assert all(account.challenged for account in pool.accounts.values())
+
+    pool.reset('bob')
+    assert pool.accounts['bob'].healthy
+
+def test_writes_are_pinned(pool):
+    assert pool.writer is pool.accounts['alice'].api
+    pool.pin_writer('bob')
+
+    bob = pool.accounts['bob']
+    bob.api.follow_user = lambda user_id: user_id
+    available = bob.limiter.available
+    assert pool.follow_user(7) == 7
+    assert bob.limiter.available < available
+
+    def throttled(user_id):
+        raise RateLimitedError('Please wait a few minutes before you try again.')
+
+    bob.api.follow_user = throttled
+    with pytest.raises(RateLimitedError):
+        pool.follow_user(7)
+    assert not bob.healthy and bob.in_flight == 0
+
+def test_reset_logs_expired_accounts_in_again(pool):
+    alice = pool.accounts['alice']
+
+    def expired(user_id):
+        raise LoginRequiredError('login_required')
+
+    alice.api.get_user_profile = expired
+    pool.accounts['bob'].api.get_user_profile = lambda user_id: user_id
+    assert pool.get_user_profile(1) == 1
+    assert not alice.healthy
+
+    alice.api.login = lambda: setattr(alice.api, 'is_logged_in', True) or True
+    pool.reset('alice')
+    assert alice.healthy
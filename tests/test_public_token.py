@@ -0,0 +1,71 @@
+import json
+import threading
+import time
+
+import requests
+
+from threadspy.auth import MemoryTokenStore
+from threadspy.client import ThreadsApi
+
+def make_response(status_code, body):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body.encode()
+    response.url = 'https://www.threads.net/api/graphql'
+    return response
+
+def make_api(tokens):
+    api = ThreadsApi(settings_file='', token_store=MemoryTokenStore())
+    api.auth.get_public_api_token = lambda: tokens.pop(0)
+    return api
+
+def test_rejected_lsd_token_is_replaced_and_retried():
+    api = make_api(['stale', 'fresh'])
+    sent = []
+
+    def request(method, url, data=None, **kwargs):
+        sent.append(data['lsd'])
+        if data['lsd'] == 'stale':
+            return make_response(200, 'for (;;);{"error":1357001}')
+        return make_response(200, json.dumps({'threads': [{'id': '1'}]}))
+
+    api.session.request = request
+
+    assert [thread.id for thread in api.get_user_threads(1)] == ['1']
+    assert [thread.id for thread in api.get_user_threads(2)] == ['1']
+    assert sent == ['stale', 'fresh', 'fresh']
+
+def test_lsd_token_expires_after_ttl():
+    api = make_api(['first', 'second'])
+    api.public_token_ttl = 60
+
+    assert api.get_public_headers['X-FB-LSD'] == 'first'
+    assert api.get_public_headers['X-FB-LSD'] == 'first'
+    api._public_token_at -= 61
+    assert api.get_public_headers['X-FB-LSD'] == 'second'
+
+def test_batch_timelines_share_one_token():
+    api = make_api(['shared'])
+    in_flight, peak = [0], [0]
+    lock = threading.Lock()
+
+    def request(method, url, data=None, **kwargs):
+        assert data['lsd'] == 'shared'
+        user_id = json.loads(data['variables'])['userID']
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+        if user_id == 13:
+            return None
+        return make_response(200, json.dumps({'threads': [{'id': str(user_id)}]}))
+
+    api.session.request = request
+    results = dict(api.get_users_threads(range(40), max_workers=4))
+
+    assert sorted(results) == list(range(40))
+    assert results[7][0].id == '7'
+    assert isinstance(results[13], Exception)
+    assert peak[0] <= 4
@@ -0,0 +1,78 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from threadspy.auth import MemoryTokenStore, Settings
+from threadspy.client import ThreadsApi
+from threadspy.exceptions import LoginRequiredError
+
+def make_response(status_code, data):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(data).encode()
+    response.url = 'https://i.instagram.com/api/v1/users/1/info/'
+    return response
+
+@pytest.fixture
+def api(tmp_path):
+    store = MemoryTokenStore()
+    store.set('user', 'old-token')
+    api = ThreadsApi('user', 'secret', settings_file=str(tmp_path / 'settings.json'), token_store=store)
+    api.private_token = 'old-token'
+    api.is_logged_in = True
+    return api
+
+def test_expired_token_is_refreshed_once_across_threads(api):
+    refreshes = []
+    def get_token(refresh=False):
+        if refresh:
+            refreshes.append(threading.get_ident())
+            time.sleep(0.05)
+            return 'new-token'
+        return 'old-token'
+
+    def request(method, url, headers=None, **kwargs):
+        if headers['Authorization'].endswith('old-token'):
+            return make_response(401, {'message': 'login_required', 'status': 'fail'})
+        return make_response(200, {'user': {'pk': 1, 'username': 'zuck'}})
+
+    api.auth.get_instagram_api_token = get_token
+    api.session.request = request
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        users = list(executor.map(api.get_user_profile, range(16)))
+
+    assert all(user.username == 'zuck' for user in users)
+    assert len(refreshes) == 1
+    assert api.private_token == 'new-token'
+
+def test_replay_happens_only_once(api):
+    api.auth.get_instagram_api_token = lambda refresh=False: 'still-bad'
+    api.session.request = lambda *args, **kwargs: make_response(403, {'message': 'login_required', 'status': 'fail'})
+
+    with pytest.raises(LoginRequiredError):
+        api.get_user_profile(1)
+
+def test_background_refresher_renews_old_tokens(api):
+    api.auth.token_issued_at = time.time() - 100
+    api.auth.get_instagram_api_token = lambda refresh=False: 'renewed' if refresh else 'old-token'
+
+    api.start_token_refresher(max_age=50, check_interval=0.01)
+    deadline = time.time() + 2
+    while api.private_token != 'renewed' and time.time() < deadline:
+        time.sleep(0.01)
+    api.stop_token_refresher()
+
+    assert api.private_token == 'renewed'
+
+def test_refresh_stamps_the_warm_start_window(api, tmp_path):
+    api.auth.settings = Settings.from_dict({'mid': 'abc'})
+    api.auth.get_instagram_api_token = lambda refresh=False: 'new-token' if refresh else 'old-token'
+
+    assert api.refresh_token('old-token') == 'new-token'
+    saved = json.loads((tmp_path / 'settings.json').read_text())
+    assert time.time() - saved['verified_at'] < 60
@@ -0,0 +1,65 @@
+from threadspy import search
+from threadspy.models import Thread
+from threadspy.search import CaptionIndex, tokenize
+
+def make_thread(pk, text, username='zuck', taken_at=0):
+    return Thread.from_dict({
+        'id': pk,
+        'thread_items': [{
+            'post': {
+                'pk': pk,
+                'taken_at': taken_at,
+                'user': {'username': username},
+                'caption': {'text': text},
+            },
+        }],
+    })
+
+THREADS = [
+    make_thread('1', 'Shipping type hints for #Python today, thanks @guido', taken_at=100),
+    make_thread('2', 'Python hints: use type aliases', taken_at=200),
+    make_thread('3', 'Java is also fine #python', username='mosseri', taken_at=300),
+]
+
+def test_tokenize_keeps_hashtags_and_mentions():
+    assert tokenize('Hi @some.user, see #Threads!') == ['hi', '@some.user', 'see', '#threads']
+
+def test_boolean_phrase_and_filters():
+    index = CaptionIndex()
+    assert index.add_threads(THREADS) == 3
+    assert index.add_threads(THREADS) == 0
+
+    ids = lambda results: [post.id for post in results]
+    assert ids(index.search('#python')) == ['3', '1']
+    assert ids(index.search('"type hints"')) == ['1']
+    assert ids(index.search('hints -"type hints"')) == ['2']
+    assert ids(index.search('(java OR @guido) AND NOT aliases')) == ['3', '1']
+    assert ids(index.search('#python', author='ZUCK')) == ['1']
+    assert ids(index.search('python OR #python', since=150, until=250)) == ['2']
+
+def test_index_persists_incrementally(tmp_path):
+    path = str(tmp_path / 'captions.jsonl')
+    with CaptionIndex(path) as index:
+        index.add_thread(THREADS[0])
+    with CaptionIndex(path) as index:
+        index.add_thread(THREADS[1])
+        assert len(index) == 2
+
+    assert [post.id for post in CaptionIndex(path).search('hints')] == ['2', '1']
+
+def test_saved_postings_are_loaded_without_tokenizing(tmp_path, monkeypatch):
+    path = str(tmp_path / 'captions.jsonl')
+    with CaptionIndex(path) as index:
+        index.add_threads(THREADS[:2])
+
+    with open(path, 'a') as file:
+        file.write('{"id":"9","thread_id":"9","author":"zuck","taken_at":50,"text":"late hints"}\n')
+
+    tokenized = []
+    original = search.tokenize
+    monkeypatch.setattr(search, 'tokenize', lambda text: tokenized.append(text) or original(text))
+
+    index = CaptionIndex(path)
+    assert tokenized == ['late hints']
+    assert [post.id for post in index.search('hints')] == ['2', '1', '9']
+    assert index.search('"type hints"')[0].id == '1'
@@ -0,0 +1,59 @@
+import json
+import os
+import threading
+import time
+
+from threadspy.auth import CachedTokenStore, FileTokenStore, Settings
+from threadspy.client import ThreadsApi
+from threadspy.utils import file_lock
+
+def make_api(tmp_path):
+    # A separate store per client behaves like a separate worker process
+    store = CachedTokenStore(FileTokenStore(str(tmp_path / 'token.bin'), 'secret'))
+    return ThreadsApi('user', 'secret', settings_file=str(tmp_path / 'settings.json'), token_store=store)
+
+def test_settings_are_written_atomically(tmp_path):
+    api = make_api(tmp_path)
+    api.settings = Settings.from_dict({'mid': 'abc'})
+    api._save_settings()
+
+    assert json.loads((tmp_path / 'settings.json').read_text())['mid'] == 'abc'
+    assert sorted(os.listdir(tmp_path)) == ['settings.json', 'settings.json.lock']
+
+def test_file_lock_excludes_other_holders(tmp_path):
+    path = str(tmp_path / 'settings.json')
+    events = []
+
+    def contender():
+        with file_lock(path):
+            events.append('contender')
+
+    with file_lock(path):
+        thread = threading.Thread(target=contender)
+        thread.start()
+        time.sleep(0.1)
+        events.append('holder')
+    thread.join()
+
+    assert events == ['holder', 'contender']
+
+def test_peer_refreshed_token_and_settings_are_reused(tmp_path):
+    first, second = make_api(tmp_path), make_api(tmp_path)
+    first.auth.token_store.set('user', 'old-token')
+    assert second.auth.get_instagram_api_token() == 'old-token'
+
+    # The first worker logs in again and publishes a new token and settings
+    first.auth.token_store.set('user', 'new-token')
+    (tmp_path / 'settings.json').write_text(json.dumps({'mid': 'peer', 'user_id': 42}))
+
+    logins = []
+    original = second.auth.get_instagram_api_token
+    def get_token(refresh=False):
+        if refresh:
+            logins.append(True)
+        return original(refresh=False)
+    second.auth.get_instagram_api_token = get_token
+
+    assert second.refresh_token('old-token') == 'new-token'
+    assert logins == []
+    assert second.settings.mid == 'peer'
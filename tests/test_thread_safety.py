@@ -0,0 +1,83 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from threadspy.auth import MemoryTokenStore
+from threadspy.client import ThreadsApi
+from threadspy.constants import ENDPOINTS
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _send(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.headers['Authorization'] != 'Bearer IGT:2:new-token':
+            return self._send(401, {'message': 'login_required', 'status': 'fail'})
+        user_id = int(self.path.split('/')[-3])
+        self._send(200, {'user': {'pk': user_id, 'username': f'user{user_id}'}})
+
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers['Content-Length'])).decode())
+        assert form['lsd'] == [self.headers['X-FB-LSD']] == ['lsd-token']
+        user_id = json.loads(form['variables'][0])['userID']
+        self._send(200, {'threads': [{'id': str(user_id)}]})
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def api(monkeypatch):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    monkeypatch.setattr(ENDPOINTS, 'INSTA_API_BASE', base + '/api/v1')
+    monkeypatch.setattr(ENDPOINTS, 'THREADS_API_BASE', base + '/api/graphql')
+
+    api = ThreadsApi('user', 'secret', settings_file='', token_store=MemoryTokenStore(), max_connections=16)
+    api.private_token = 'old-token'
+    api.is_logged_in = True
+    yield api
+    server.shutdown()
+
+@pytest.mark.parametrize('session_per_thread', [False, True])
+def test_one_client_shared_by_many_threads(api, session_per_thread):
+    api.session_per_thread = session_per_thread
+    fetches = {'public': 0, 'private': 0}
+
+    def get_public_api_token():
+        fetches['public'] += 1
+        time.sleep(0.05)
+        return 'lsd-token'
+
+    def get_instagram_api_token(refresh=False):
+        if refresh:
+            fetches['private'] += 1
+            time.sleep(0.05)
+            return 'new-token'
+        return 'old-token'
+
+    api.auth.get_public_api_token = get_public_api_token
+    api.auth.get_instagram_api_token = get_instagram_api_token
+
+    def job(user_id):
+        if user_id % 2:
+            return [thread.id for thread in api.get_user_threads(user_id)]
+        return api.get_user_profile(user_id).username
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(job, range(200)))
+
+    assert results == [[str(i)] if i % 2 else f'user{i}' for i in range(200)]
+    assert fetches == {'public': 1, 'private': 1}
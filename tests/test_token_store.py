@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from threadspy.auth import Authorization, CachedTokenStore, FileTokenStore, MemoryTokenStore, TokenStore, default_token_store
+
+def test_file_token_store_round_trip(tmp_path):
+    path = str(tmp_path / 'token.bin')
+    store = FileTokenStore(path, 'secret')
+    assert store.get('user') is None
+
+    store.set('user', 'abc')
+    assert open(path, 'rb').read() != b'abc'
+    assert FileTokenStore(path, 'secret').get('user') == 'abc'
+    assert FileTokenStore(path, 'other-password').get('user') is None
+    assert [name for name in os.listdir(tmp_path)] == ['token.bin']
+
+def test_cached_store_reads_file_once(tmp_path):
+    path = str(tmp_path / 'token.bin')
+    FileTokenStore(path, 'secret').set('user', 'abc')
+    store = CachedTokenStore(FileTokenStore(path, 'secret'))
+
+    assert store.get('user') == 'abc'
+    os.remove(path)
+    assert store.get('user') == 'abc'
+
+    store.set('user', 'def')
+    assert FileTokenStore(path, 'secret').get('user') == 'def'
+
+def test_default_store_is_shared_per_path(tmp_path):
+    path = str(tmp_path / 'token.bin')
+    assert default_token_store(path, 'secret') is default_token_store(path, 'secret')
+
+def test_authorization_reuses_stored_token_without_login():
+    store = MemoryTokenStore()
+    store.set('user', 'stored-token')
+    auth = Authorization(username='user', password='secret', token_store=store)
+
+    assert auth.get_instagram_api_token() == 'stored-token'
+
+def test_incomplete_token_store_fails_on_creation():
+    class GetOnlyStore(TokenStore):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnlyStore()
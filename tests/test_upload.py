@@ -0,0 +1,143 @@
+import io
+import json
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+import pytest
+
+from threadspy.auth import MemoryTokenStore, Settings
+from threadspy.client import ThreadsApi
+from threadspy.constants import ENDPOINTS
+from threadspy.upload import open_upload_source
+
+class RuploadHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    uploads = {}
+    configured = []
+    failed = set()
+    always_fail = False
+    latency = 0
+
+    def _send(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path.startswith('/api/v1/media/configure'):
+            body = self.rfile.read(int(self.headers['Content-Length'])).decode()
+            self.configured.append(json.loads(unquote(body.split('SIGNATURE.', 1)[1])))
+            return self._send(200, {'status': 'ok'})
+
+        length = int(self.headers['Content-Length'])
+        head, size = b'', 0
+        while size < length:
+            chunk = self.rfile.read(min(65536, length - size))
+            head = head or chunk[:8]
+            size += len(chunk)
+        time.sleep(self.latency)
+        if head.startswith(b'flaky') and (self.always_fail or head not in self.failed):
+            self.failed.add(head)
+            return self._send(400, {'status': 'fail'})
+        name = self.path.rsplit('/', 1)[-1]
+        self.uploads[name] = {
+            'length': int(self.headers['X-Entity-Length']),
+            'type': self.headers['X-Entity-Type'],
+            'head': head,
+            'size': size,
+        }
+        self._send(200, {'upload_id': head.decode(errors='replace'), 'status': 'ok'})
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def api(monkeypatch):
+    RuploadHandler.uploads = {}
+    RuploadHandler.configured = []
+    RuploadHandler.failed = set()
+    RuploadHandler.always_fail = False
+    RuploadHandler.latency = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RuploadHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    monkeypatch.setattr(ENDPOINTS, 'INSTA_BASE', base)
+    monkeypatch.setattr(ENDPOINTS, 'INSTA_API_BASE', base + '/api/v1')
+
+    api = ThreadsApi('user', settings_file='', token_store=MemoryTokenStore())
+    api.private_token = 'token'
+    api.user_id = 1
+    api.settings = Settings.from_dict({
+        'uuids': {'android_device_id': 'android-1'},
+        'device_settings': {'manufacturer': 'x', 'model': 'y', 'android_version': 26, 'android_release': '8.0.0'},
+    })
+    yield api
+    server.shutdown()
+
+@pytest.mark.parametrize('kind', ['path', 'file', 'bytes', 'memoryview'])
+def test_upload_sources(api, tmp_path, kind):
+    data = b'\xff\xd8\xff' + bytes(range(256)) * 100
+    path = tmp_path / 'image.png'
+    path.write_bytes(data)
+    image = {
+        'path': str(path),
+        'file': open(path, 'rb'),
+        'bytes': data,
+        'memoryview': memoryview(bytearray(data)),
+    }[kind]
+
+    assert api._upload_image(image) is not None
+    (upload,) = RuploadHandler.uploads.values()
+    assert upload['length'] == upload['size'] == len(data)
+    assert upload['head'] == data[:8]
+    assert upload['type'] == ('image/png' if kind in ('path', 'file') else 'image/jpeg')
+
+def test_large_file_is_streamed(api, tmp_path):
+    path = tmp_path / 'large.jpg'
+    with open(path, 'wb') as file:
+        for _ in range(32):
+            file.write(b'\x00' * (1024 * 1024))
+
+    tracemalloc.start()
+    api._upload_image(str(path))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    (upload,) = RuploadHandler.uploads.values()
+    assert upload['size'] == 32 * 1024 * 1024
+    assert peak < 4 * 1024 * 1024
+
+def test_source_reads_from_current_position():
+    stream = io.BytesIO(b'skip-image')
+    stream.seek(5)
+    source = open_upload_source(stream)
+    assert len(source) == 5 and source.read() == b'image' and len(source) == 0
+
+def test_carousel_children_upload_in_parallel(api, monkeypatch):
+    monkeypatch.setattr(api, 'UPLOAD_RETRY_DELAY', 0)
+    RuploadHandler.latency = 0.2
+    images = [f'image{i}'.encode() for i in range(5)] + [b'flaky-5']
+
+    started = time.time()
+    assert api.create('carousel', image=images, max_workers=6) == {'status': 'ok'}
+    elapsed = time.time() - started
+
+    # Six uploads one after another take 1.2 s, plus a second try for the flaky one
+    assert elapsed < 0.9
+    (configured,) = RuploadHandler.configured
+    assert [child['upload_id'] for child in configured['children_metadata']] == [
+        'image0', 'image1', 'image2', 'image3', 'image4', 'flaky-5',
+    ]
+
+def test_carousel_is_not_configured_when_a_child_fails(api, monkeypatch):
+    monkeypatch.setattr(api, 'UPLOAD_RETRY_DELAY', 0)
+    RuploadHandler.always_fail = True
+
+    assert api.create('carousel', image=[b'image0', b'flaky-1']) is False
+    assert RuploadHandler.configured == []
@@ -0,0 +1,59 @@
+import json
+import time
+
+import requests
+
+from threadspy.auth import MemoryTokenStore
+from threadspy.client import ThreadsApi
+
+def make_response(status_code, data):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(data).encode()
+    response.url = 'https://i.instagram.com/api/v1/users/314216/info/'
+    return response
+
+def make_api(tmp_path, verified_at):
+    settings_file = tmp_path / 'settings.json'
+    settings_file.write_text(json.dumps({'verified_at': verified_at, 'user_id': 42}))
+    store = MemoryTokenStore()
+    store.set('user', 'stored-token')
+    return ThreadsApi('user', 'secret', settings_file=str(settings_file), token_store=store)
+
+def test_warm_start_skips_verification(tmp_path):
+    api = make_api(tmp_path, time.time())
+    api.session.request = lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError('no request expected'))
+
+    assert api.login() is True
+    assert api.user_id == 42
+    assert api.private_token == 'stored-token'
+
+def test_stale_warm_start_verifies_lazily(tmp_path):
+    api = make_api(tmp_path, time.time())
+    api.login()
+
+    sent_tokens = []
+    def request(method, url, headers=None, **kwargs):
+        sent_tokens.append(headers['Authorization'])
+        if len(sent_tokens) == 1:
+            return make_response(403, {'message': 'login_required', 'status': 'fail'})
+        return make_response(200, {'user': {'pk': 314216, 'username': 'zuck'}})
+
+    def verify():
+        api.user_id = 42
+        return api.private_token == 'fresh-token'
+
+    api.session.request = request
+    api._verify_login = verify
+    api.auth.get_instagram_api_token = lambda refresh=False: 'fresh-token' if refresh else 'stored-token'
+
+    assert api.get_user_profile(314216).username == 'zuck'
+    assert sent_tokens == ['Bearer IGT:2:stored-token', 'Bearer IGT:2:fresh-token']
+
+def test_expired_window_verifies_on_login(tmp_path):
+    api = make_api(tmp_path, time.time() - 7200)
+    verified = []
+    api._verify_login = lambda: verified.append(True) or True
+
+    assert api.login() is True
+    assert verified == [True]
@@ -0,0 +1,68 @@
+from threadspy.models import Thread, ThreadsUser
+from threadspy.watcher import AccountWatcher
+
+def make_thread(thread_id, taken_at):
+    return Thread.from_dict({
+        'id': thread_id,
+        'thread_items': [{'post': {'pk': thread_id, 'taken_at': taken_at}}],
+    })
+
+class FakeApi:
+    def __init__(self):
+        self.follower_count = 10
+        self.threads = [make_thread('1', 1000), make_thread('2', 4600)]
+        self.calls = 0
+
+    def get_user_profile(self, user_id):
+        self.calls += 1
+        return ThreadsUser.from_dict({'pk': user_id, 'follower_count': self.follower_count})
+
+    def get_user_threads_auth(self, user_id):
+        self.calls += 1
+        return list(self.threads)
+
+def test_watcher_emits_changes_after_first_poll():
+    api = FakeApi()
+    watcher = AccountWatcher(api, requests_per_minute=6000, min_interval=1, max_interval=100000, jitter=0)
+    events = []
+    watcher.add_callback(events.append)
+    watcher.watch(314216)
+
+    watcher.poll_once(now=float('inf'))
+    assert events == []
+    assert api.calls == 2
+
+    api.follower_count = 11
+    api.threads.insert(0, make_thread('3', 8200))
+    watcher.poll_once(now=float('inf'))
+
+    types = sorted(event.type for event in events)
+    assert types == [AccountWatcher.NEW_THREAD, AccountWatcher.PROFILE_CHANGE]
+    change = next(event for event in events if event.type == AccountWatcher.PROFILE_CHANGE)
+    assert change.data == {'follower_count': (10, 11)}
+
+def test_watcher_adapts_interval_to_posting_rate():
+    api = FakeApi()
+    watcher = AccountWatcher(api, requests_per_minute=6000, min_interval=1, max_interval=100000, jitter=0)
+    watcher.watch(1)
+    watcher.poll_once(now=float('inf'))
+    account = watcher.accounts[1]
+
+    # Posts are an hour apart, so the account is polled every half hour
+    assert account.post_gap == 3600
+    quiet_interval = account.interval
+    assert quiet_interval == 1800
+
+    watcher.poll_once(now=float('inf'))
+    assert watcher.accounts[1].interval > quiet_interval
+
+    api.threads.insert(0, make_thread('3', 8200))
+    watcher.poll_once(now=float('inf'))
+    assert watcher.accounts[1].interval == account.post_gap / 2
+
+def test_unwatch_drops_scheduled_account():
+    watcher = AccountWatcher(FakeApi(), requests_per_minute=6000, min_interval=1)
+    watcher.watch(1)
+    watcher.unwatch(1)
+
+    assert watcher.poll_once(now=float('inf')) is None
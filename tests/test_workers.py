@@ -0,0 +1,56 @@
+import json
+import multiprocessing
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from threadspy.client import ThreadsApi
+from threadspy.constants import ENDPOINTS
+from threadspy.models import ThreadsUser
+from threadspy.workers import WorkerPool, decode_payload, encode_payload
+
+class ProfileHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        user_id = int(self.path.split('/')[-3])
+        if self.headers['Authorization'] != 'Bearer IGT:2:shared-token':
+            self.send_response(401)
+            body = b'{"message": "login_required"}'
+        else:
+            self.send_response(200)
+            body = json.dumps({'user': {'pk': user_id, 'username': f'user{user_id}', 'bio_links': []}}).encode()
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def api_server(monkeypatch):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ProfileHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(ENDPOINTS, 'INSTA_API_BASE', f'http://127.0.0.1:{server.server_address[1]}/api/v1')
+    yield
+    server.shutdown()
+
+def test_payload_round_trip_is_compact():
+    user = ThreadsUser.from_dict({'pk': 1, 'username': 'zuck', 'bio_links': [{'url': 'https://a.b'}]}, threads_client=object())
+    payload = encode_payload(user)
+
+    assert decode_payload(payload) == {'username': 'zuck', 'bio_links': [{'url': 'https://a.b'}], 'pk': 1}
+    rebuilt = decode_payload(payload, rebuild=True)
+    assert rebuilt.username == 'zuck' and rebuilt.bio_links[0].url == 'https://a.b'
+
+def test_workers_share_exported_session(tmp_path, api_server):
+    api = ThreadsApi('user', settings_file=str(tmp_path / 'settings.json'))
+    api.private_token = 'shared-token'
+    api.is_logged_in = True
+
+    with WorkerPool(api.export_session(), processes=2, mp_context=multiprocessing.get_context('fork')) as pool:
+        profiles = list(pool.map('get_user_profile', range(1, 6), rebuild=True, threads_client=api))
+
+        assert [profile.username for profile in profiles] == [f'user{i}' for i in range(1, 6)]
+        assert profiles[0]._threads_client is api
+        with pytest.raises(ValueError):
+            pool.submit('follow_user', 1)
@@ -0,0 +1,203 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from threadspy.models import FriendshipStatus, Thread, ThreadsUser
+from threadspy.utils import RateLimiter
+
+# Maps each ThreadsApi action to (state it changes, value it sets)
+ACTIONS = {
+    'follow_user': ('follow', True),
+    'unfollow_user': ('follow', False),
+    'mute_user': ('mute', True),
+    'unmute_user': ('mute', False),
+    'block_user': ('block', True),
+    'unblock_user': ('block', False),
+    'restrict_user': ('restrict', True),
+    'unrestrict_user': ('restrict', False),
+    'like': ('like', True),
+    'unlike': ('like', False),
+    'repost': ('repost', True),
+    'unrepost': ('repost', False),
+}
+
+# FriendshipStatus attribute that reflects each friendship state
+FRIENDSHIP_FIELDS = {
+    'follow': 'following',
+    'mute': 'muting',
+    'block': 'blocking',
+    'restrict': 'is_restricted',
+}
+
+DONE = 'done'
+SKIPPED = 'skipped'
+COALESCED = 'coalesced'
+CANCELLED = 'cancelled'
+FAILED = 'failed'
+
+@dataclass
+class ActionOutcome:
+    action: str
+    target: Any
+    status: Optional[str] = None
+    result: Any = None
+    error: Optional[Exception] = None
+
+@dataclass
+class PendingAction:
+    action: str
+    target: Any
+    status: Optional[FriendshipStatus] = None
+    outcomes: List[ActionOutcome] = field(default_factory=list)
+
+class ActionQueue:
+    def __init__(
+            self,
+            threads_api,
+            max_workers: int = 4,
+            requests_per_minute: float = 30,
+            check_status: bool = False,
+    ):
+        """
+        Initialize the ActionQueue object.
+
+        Queued actions are coalesced per target before anything is sent: repeated actions
+        collapse into one and an action followed by its opposite (follow then unfollow)
+        replaces it, so only the final state is sent. Friendship actions whose
+        FriendshipStatus already matches are skipped.
+
+        Parameters:
+            threads_api (ThreadsApi): A logged in client.
+            max_workers (int, optional): The maximum number of concurrent requests. Default is 4.
+            requests_per_minute (float, optional): The write request budget. Default is 30.
+            check_status (bool, optional): If True, fetch the friendship status of targets with no
+                known status before acting on them. Default is False.
+        """
+
+        self.threads_api = threads_api
+        self.max_workers = max_workers
+        self.check_status = check_status
+        self.limiter = RateLimiter(requests_per_minute, per=60)
+
+        self._pending: Dict[Tuple[str, str], PendingAction] = {}
+        self._outcomes: List[ActionOutcome] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, action: str, target: Any, status: Optional[FriendshipStatus] = None) -> ActionOutcome:
+        """
+        Queue an action.
+
+        Parameters:
+            action (str): The ThreadsApi method name, e.g. "follow_user" or "like".
+            target (int, str, ThreadsUser or Thread): The user or thread to act on.
+                A ThreadsUser also provides its known friendship_status.
+            status (FriendshipStatus, optional): The known friendship status with the target.
+
+        Returns:
+            ActionOutcome: The outcome of this item, filled in when the queue runs.
+        """
+
+        if action not in ACTIONS:
+            raise ValueError(f"Unsupported action: {action}")
+
+        if isinstance(target, ThreadsUser):
+            status = status if status is not None else target.friendship_status
+            target = target.pk
+        elif isinstance(target, Thread):
+            target = target.id
+
+        family, _ = ACTIONS[action]
+        key = (family, str(target))
+        outcome = ActionOutcome(action=action, target=target)
+
+        with self._lock:
+            self._outcomes.append(outcome)
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = PendingAction(action, target, status, [outcome])
+            elif pending.action == action:
+                outcome.status = COALESCED
+                pending.status = status if status is not None else pending.status
+            else:
+                # The last action sets the final state, _is_noop skips it if nothing changes
+                for cancelled in pending.outcomes:
+                    cancelled.status = CANCELLED
+                status = status if status is not None else pending.status
+                self._pending[key] = PendingAction(action, target, status, [outcome])
+        return outcome
+
+    def run(self) -> List[ActionOutcome]:
+        """
+        Execute the queued actions concurrently within the request budget.
+
+        Returns:
+            List[ActionOutcome]: One outcome per added item, in the order they were added.
+        """
+
+        with self._lock:
+            pending = list(self._pending.values())
+            outcomes = self._outcomes
+            self._pending = {}
+            self._outcomes = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(self._execute, pending))
+
+        return outcomes
+
+    def _is_noop(self, pending: PendingAction) -> bool:
+        """
+        Internal method to check whether the known state already matches the action.
+
+        Returns:
+            bool: True if the action would not change anything.
+        """
+
+        family, desired = ACTIONS[pending.action]
+        attribute = FRIENDSHIP_FIELDS.get(family)
+        if attribute is None:
+            return False
+
+        if pending.status is None and self.check_status:
+            self.limiter.acquire()
+            pending.status = self.threads_api.get_friendship_status(pending.target).friendship_status
+        if pending.status is None:
+            return False
+
+        current = getattr(pending.status, attribute)
+        if family == 'follow' and desired and pending.status.outgoing_request:
+            # A follow request to a private account is already pending
+            return True
+        return current is not None and bool(current) == desired
+
+    def _execute(self, pending: PendingAction):
+        """
+        Internal method to run one coalesced action and record its outcome.
+        """
+
+        outcome = pending.outcomes[0]
+        try:
+            if self._is_noop(pending):
+                outcome.status = SKIPPED
+                return
+
+            self.limiter.acquire()
+            result = getattr(self.threads_api, pending.action)(pending.target)
+            outcome.result = result
+            outcome.status = DONE if self._succeeded(result) else FAILED
+        except Exception as exception:
+            outcome.status = FAILED
+            outcome.error = exception
+
+    @staticmethod
+    def _succeeded(result: Any) -> bool:
+        if isinstance(result, bool):
+            return result
+        if result is None:
+            return False
+        status = getattr(result, 'status', None)
+        return status is None or status == 'ok'
@@ -1,13 +1,14 @@
 import requests
 import re
-from threadspy.utils import get_default_headers
+from abc import ABC, abstractmethod
+from threadspy.utils import atomic_write, file_version, get_default_headers
 import base64
 from typing import Union
-from instagrapi import Client
-from cryptography.fernet import Fernet
 import os
+import threading
+import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 @dataclass
 class Settings:
@@ -24,6 +25,8 @@ class Settings:
     country_code: int
     locale: str
     timezone_offset: int
+    verified_at: float = 0.0
+    user_id: Optional[int] = None
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Settings':
@@ -40,7 +43,9 @@ class Settings:
             country=data.get('country', ''),
             country_code=data.get('country_code', 0),
             locale=data.get('locale', ''),
-            timezone_offset=data.get('timezone_offset', 0)
+            timezone_offset=data.get('timezone_offset', 0),
+            verified_at=data.get('verified_at', 0.0),
+            user_id=data.get('user_id')
         )
 
     def to_dict(self) -> dict:
@@ -57,10 +62,280 @@ class Settings:
             'country': self.country,
             'country_code': self.country_code,
             'locale': self.locale,
-            'timezone_offset': self.timezone_offset
+            'timezone_offset': self.timezone_offset,
+            'verified_at': self.verified_at,
+            'user_id': self.user_id
         }
 
 
+@dataclass
+class SessionSnapshot:
+    username: Optional[str]
+    private_token: Optional[str]
+    public_token: Optional[str]
+    user_id: Optional[int]
+    settings: Optional[dict]
+    timeout: int = 10
+    retries: int = 3
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SessionSnapshot':
+        return cls(
+            username=data.get('username'),
+            private_token=data.get('private_token'),
+            public_token=data.get('public_token'),
+            user_id=data.get('user_id'),
+            settings=data.get('settings'),
+            timeout=data.get('timeout', 10),
+            retries=data.get('retries', 3)
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'username': self.username,
+            'private_token': self.private_token,
+            'public_token': self.public_token,
+            'user_id': self.user_id,
+            'settings': self.settings,
+            'timeout': self.timeout,
+            'retries': self.retries
+        }
+
+
+def generate_key_from_password(password: str) -> bytes:
+    """
+    Generate the encryption key from the provided password.
+
+    Parameters:
+        password (str): The password used to generate the key.
+
+    Returns:
+        bytes: The encryption key.
+    """
+
+    # Pad the password if its length is less than 32 bytes
+    while len(password) < 32:
+        password += password
+    # Truncate the password if its length exceeds 32 bytes
+    password = password[:32]
+    # Convert the password to URL-safe base64 encoding
+    key = base64.urlsafe_b64encode(password.encode())
+    return key
+
+
+class TokenStore(ABC):
+    """
+    Base class for token stores.
+
+    Subclass it and implement get, set and delete to keep tokens in an external store
+    such as Redis or a secrets manager, then pass the instance as ``token_store``.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a stored token.
+
+        Parameters:
+            key (str): The token key, usually the username.
+
+        Returns:
+            str or None: The token, or None if there is none.
+        """
+
+        pass
+
+    @abstractmethod
+    def set(self, key: str, token: str):
+        """
+        Store a token.
+
+        Parameters:
+            key (str): The token key, usually the username.
+            token (str): The token.
+        """
+
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        """
+        Remove a stored token.
+
+        Parameters:
+            key (str): The token key, usually the username.
+        """
+
+        pass
+
+
+class MemoryTokenStore(TokenStore):
+    """
+    Token store that only keeps tokens in process memory.
+    """
+
+    def __init__(self):
+        self._tokens: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._tokens.get(key)
+
+    def set(self, key: str, token: str):
+        with self._lock:
+            self._tokens[key] = token
+
+    def delete(self, key: str):
+        with self._lock:
+            self._tokens.pop(key, None)
+
+
+class FileTokenStore(TokenStore):
+    """
+    Token store that keeps one Fernet encrypted token in a file, replaced atomically on every write.
+    """
+
+    def __init__(self, path: str, password: str):
+        """
+        Initialize the FileTokenStore object.
+
+        Parameters:
+            path (str): The path of the encrypted token file.
+            password (str): The password the encryption key is derived from.
+        """
+
+        self.path = path
+        self._password = password
+        self._cipher = None
+
+    @property
+    def cipher(self):
+        if self._cipher is None:
+            if not self._password:
+                raise ValueError("A password is required to encrypt the token")
+
+            from cryptography.fernet import Fernet
+
+            self._cipher = Fernet(generate_key_from_password(self._password))
+        return self._cipher
+
+    def get(self, key: str) -> Optional[str]:
+        if not os.path.exists(self.path):
+            return None
+
+        from cryptography.fernet import InvalidToken
+
+        with open(self.path, 'rb') as file:
+            encrypted_token = file.read()
+        try:
+            return self.cipher.decrypt(encrypted_token).decode()
+        except InvalidToken:
+            # Written with another password or corrupted, treat it as missing
+            return None
+
+    def set(self, key: str, token: str):
+        atomic_write(self.path, self.cipher.encrypt(token.encode()))
+
+    def delete(self, key: str):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def version(self) -> Optional[Tuple[int, int, int]]:
+        """
+        Get a fingerprint of the token file that changes when any process rewrites it.
+
+        Returns:
+            tuple or None: The file fingerprint, or None if there is no file.
+        """
+
+        return file_version(self.path)
+
+
+class CachedTokenStore(TokenStore):
+    """
+    Token store that keeps tokens in memory in front of another store.
+
+    Reads are served from memory after the first hit, writes go to both. If the backend
+    has a ``version()`` method, the cache is dropped whenever the backend file is rewritten,
+    so a token written by another process is picked up.
+    """
+
+    def __init__(self, backend: TokenStore):
+        """
+        Initialize the CachedTokenStore object.
+
+        Parameters:
+            backend (TokenStore): The store to read through and write through to.
+        """
+
+        self.backend = backend
+        self._cache = MemoryTokenStore()
+        self._lock = threading.Lock()
+        self._version = None
+
+    def _check_version(self):
+        version = getattr(self.backend, 'version', None)
+        if version is None:
+            return
+        current = version()
+        # A missing file keeps the cached tokens, only a rewrite by another process drops them
+        if current is not None and current != self._version:
+            with self._lock:
+                self._cache = MemoryTokenStore()
+                self._version = current
+
+    def get(self, key: str) -> Optional[str]:
+        self._check_version()
+        token = self._cache.get(key)
+        if token is not None:
+            return token
+        with self._lock:
+            token = self._cache.get(key)
+            if token is None:
+                token = self.backend.get(key)
+                if token is not None:
+                    self._cache.set(key, token)
+            return token
+
+    def set(self, key: str, token: str):
+        with self._lock:
+            self.backend.set(key, token)
+            self._cache.set(key, token)
+            version = getattr(self.backend, 'version', None)
+            if version is not None:
+                self._version = version()
+
+    def delete(self, key: str):
+        with self._lock:
+            self.backend.delete(key)
+            self._cache.delete(key)
+
+
+_DEFAULT_TOKEN_STORES: Dict[Tuple[str, str], CachedTokenStore] = {}
+_DEFAULT_TOKEN_STORES_LOCK = threading.Lock()
+
+def default_token_store(path: str, password: str) -> CachedTokenStore:
+    """
+    Get the process wide cached file token store for a path, so clients sharing a token file share one cache.
+
+    Parameters:
+        path (str): The path of the encrypted token file.
+        password (str): The password the encryption key is derived from.
+
+    Returns:
+        CachedTokenStore: The shared store.
+    """
+
+    key = (os.path.abspath(path), password or '')
+    with _DEFAULT_TOKEN_STORES_LOCK:
+        store = _DEFAULT_TOKEN_STORES.get(key)
+        if store is None:
+            store = CachedTokenStore(FileTokenStore(path, password or ''))
+            _DEFAULT_TOKEN_STORES[key] = store
+        return store
+
+
 class Authorization:
     def __init__(
             self,
@@ -68,6 +343,7 @@ class Authorization:
             password: str = None,
             token_path: str = "",
             settings: Settings = None,
+            token_store: TokenStore = None,
     ):
         """
         Initialize the Authorization object.
@@ -77,12 +353,16 @@ class Authorization:
             password (str, optional): The Instagram password for authentication.
             token_path (str, optional): The path to store the encrypted token.
             settings (Settings, optional): The settings for the Instagram client.
+            token_store (TokenStore, optional): Where to keep the token. Default is an in-memory
+                cache in front of the encrypted file at token_path.
         """
 
         self.username = username
         self.password = password
         self.token_path = token_path if token_path else "threads_token.bin"
         self.settings = settings
+        self.token_store = token_store if token_store is not None else default_token_store(self.token_path, password)
+        self.token_issued_at: Optional[float] = None
         self.headers = get_default_headers()
 
     def generate_key_from_password(self, password):
@@ -96,43 +376,27 @@ class Authorization:
             bytes: The encryption key.
         """
 
-        # Pad the password if its length is less than 32 bytes
-        while len(password) < 32:
-            password += password
-        # Truncate the password if its length exceeds 32 bytes
-        password = password[:32]
-        # Convert the password to URL-safe base64 encoding
-        key = base64.urlsafe_b64encode(password.encode())
-        return key
+        return generate_key_from_password(password)
 
     def _store_token(self, token):
         """
-        Store the encrypted token in the specified file.
+        Store the token in the token store.
 
         Parameters:
-            token (str): The token to be encrypted and stored.
+            token (str): The token to be stored.
         """
 
-        cipher_suite = Fernet(self.generate_key_from_password(self.password))
-        encrypted_token = cipher_suite.encrypt(token.encode())
-        with open(self.token_path, 'wb') as file:
-            file.write(encrypted_token)
+        self.token_store.set(self.username, token)
 
     def _retrieve_token(self):
         """
-        Retrieve and decrypt the stored token.
+        Retrieve the stored token.
 
         Returns:
-            str: The decrypted token or None if not found.
+            str: The token or None if not found.
         """
 
-        cipher_suite = Fernet(self.generate_key_from_password(self.password))
-        if not os.path.exists(self.token_path):
-            return None
-        with open(self.token_path, 'rb') as file:
-            encrypted_token = file.read()
-        decrypted_token = cipher_suite.decrypt(encrypted_token)
-        return decrypted_token.decode()
+        return self.token_store.get(self.username)
 
 
     def get_instagram_api_token(self, refresh: bool = False) -> Union[str, None]:
@@ -150,6 +414,9 @@ class Authorization:
         if token is not None and not refresh:
             return token
         
+        # instagrapi is slow to import and only needed for a fresh login
+        from instagrapi import Client
+
         try:      
             iapi = Client()
             if self.settings is not None:
@@ -160,8 +427,8 @@ class Authorization:
                 self.settings = Settings.from_dict(iapi.get_settings())
             
             token = iapi.private.headers['Authorization'].split("Bearer IGT:2:")[1]
-            print(token)
             self._store_token(token)
+            self.token_issued_at = time.time()
             return token
         except Exception as e:
             print(e)
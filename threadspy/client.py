@@ -2,22 +2,31 @@ from threadspy.constants import ENDPOINTS
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from requests.exceptions import RequestException
+from requests.exceptions import HTTPError, RequestException
 import re
 from threadspy.models import *
-from threadspy.utils import get_default_headers
-from threadspy.auth import Authorization, Settings
-import mimetypes
+from threadspy.utils import atomic_write, file_lock, file_version, get_default_headers
+from threadspy.auth import Authorization, MemoryTokenStore, SessionSnapshot, Settings, TokenStore
+from threadspy.exceptions import ChallengeRequiredError, LoginRequiredError, raise_for_api_error
+from threadspy.search import CaptionIndex
+from threadspy.upload import ImageSource, MemoryReader, UploadSource, open_upload_source
 import json
 from urllib.parse import quote
 import random
+import itertools
+import threading
 import time
 from uuid import uuid4
 import os
 from http import HTTPStatus
-from typing import List, Optional, Union
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 class ThreadsApi:
+    # Seconds before the second try of a failed image upload, doubled for each further try
+    UPLOAD_RETRY_DELAY = 0.5
+
     def __init__(
             self,
             username: str = None,
@@ -25,7 +34,14 @@ class ThreadsApi:
             timeout: int = 10,
             retries: int = 3,
             token_path: str = "threads_token.bin",
-            settings_file: str = "settings.json"
+            settings_file: str = "settings.json",
+            caption_index: Optional[CaptionIndex] = None,
+            token_store: Optional[TokenStore] = None,
+            verify_window: float = 3600,
+            public_token_ttl: float = 3600,
+            max_connections: int = 10,
+            session_per_thread: bool = False,
+            upload_chunk_size: Optional[int] = None
     ):
         """
         Initializes the ThreadsApi class.
@@ -37,24 +53,53 @@ class ThreadsApi:
             retries (int, optional): The number of retries for failed requests. Default is 3.
             token_path (str, optional): The file path to save the authentication token. Default is "threads_token.bin".
             settings_file (str, optional): The file path to save the settings. Default is "settings.json".
+            caption_index (CaptionIndex, optional): An index that every fetched thread is added to. Default is None.
+            token_store (TokenStore, optional): Where to keep the token. Default is an in-memory cache in front of token_path.
+            verify_window (float, optional): For this many seconds after a verified login, a restart trusts the stored
+                token and only verifies it if a request is rejected. 0 always verifies. Default is 3600.
+            public_token_ttl (float, optional): How long the public LSD token is reused, in seconds. A rejected
+                token is replaced right away. Default is 3600.
+            max_connections (int, optional): The number of pooled connections per host. Default is 10.
+            session_per_thread (bool, optional): If True, every thread gets its own requests session instead of
+                sharing one. Default is False.
+            upload_chunk_size (int, optional): Upload images in chunks of this many bytes, so a failed request
+                only resends one chunk. Default is None (one request per image).
+
+        The client is thread-safe: headers are built fresh for every request and token updates are
+        serialized, so one client can be shared by all threads of a pool. Size max_connections to the
+        number of threads.
         """
 
         self.timeout = timeout
         self.retries = retries
+        self.max_connections = max_connections
+        self.session_per_thread = session_per_thread
+        self._local = threading.local()
         self.session = self._create_session()
+        self.upload_chunk_size = upload_chunk_size
+        self._upload_session = self._create_session(retries=0)
         
         self.public_token = None
+        self.public_token_ttl = public_token_ttl
+        self._public_token_at = 0.0
         self.private_token = None
         self.is_logged_in = False
         self.user_id = None
         self.settings: Settings = None
         self.settings_file = settings_file
+        self.caption_index = caption_index
+        self.verify_window = verify_window
+        self._auth_lock = threading.RLock()
+        self._public_token_lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self._refresher_stop = threading.Event()
         self._load_settings()
         self.auth = Authorization(
             username=username,
             password=password,
             token_path=token_path,
-            settings=self.settings
+            settings=self.settings,
+            token_store=token_store
         )
 
     @property
@@ -67,10 +112,86 @@ class ThreadsApi:
         """
 
         headers = get_default_headers()
-        self.public_token = self.auth.get_public_api_token()
-        headers['X-FB-LSD'] = self.public_token
+        token = self.public_token
+        if token is None or time.time() - self._public_token_at >= self.public_token_ttl:
+            with self._public_token_lock:
+                # Another thread may have fetched it while this one waited
+                if self.public_token is None or time.time() - self._public_token_at >= self.public_token_ttl:
+                    self.public_token = self.auth.get_public_api_token()
+                    self._public_token_at = time.time()
+                token = self.public_token
+        headers['X-FB-LSD'] = token
         return headers
 
+    @property
+    def session(self) -> requests.Session:
+        """
+        Property to get the requests session of the calling thread.
+
+        Returns:
+            requests.Session: The shared session, or the thread's own one if session_per_thread is set.
+        """
+
+        if not self.session_per_thread:
+            return self._session
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._create_session()
+        return session
+
+    @session.setter
+    def session(self, session: requests.Session):
+        self._session = session
+
+    def _public_graphql(self, friendly_name: str, variables: dict, doc_id: str) -> Optional[requests.Response]:
+        """
+        Internal method to make a public GraphQL request. If the response is rejected or is not
+        GraphQL data, the LSD token is fetched again and the request is retried once.
+
+        Parameters:
+            friendly_name (str): The x-fb-friendly-name of the query.
+            variables (dict): The query variables.
+            doc_id (str): The query document ID.
+
+        Returns:
+            requests.Response: The response object.
+        """
+
+        response = None
+        for _ in range(2):
+            headers = self.get_public_headers
+            token = headers['X-FB-LSD']
+            headers.update({
+                'sec-fetch-dest': 'empty',
+                'sec-fetch-mode': 'cors',
+                'sec-fetch-site': 'same-origin',
+                'x-fb-friendly-name': friendly_name
+            })
+            payload = {
+                'lsd': token,
+                'variables': json.dumps(variables),
+                'doc_id': doc_id
+            }
+            response = self._request(
+                method='POST',
+                url=ENDPOINTS.THREADS_API_BASE,
+                headers=headers,
+                data=payload
+            )
+            if response is not None:
+                try:
+                    data = response.json()
+                    if not (isinstance(data, dict) and data.get('errors') and data.get('data') is None):
+                        return response
+                except ValueError:
+                    pass
+
+            # The LSD token expired or was rejected
+            with self._public_token_lock:
+                if self.public_token == token:
+                    self.public_token = None
+        return response
+
     @property
     def get_private_headers(self):
         """
@@ -90,63 +211,235 @@ class ThreadsApi:
 
         return headers
 
+    def export_session(self) -> SessionSnapshot:
+        """
+        Exports the authenticated session as a picklable snapshot, e.g. to start worker processes.
+
+        Returns:
+            SessionSnapshot: The session snapshot.
+        """
+
+        return SessionSnapshot(
+            username=self.auth.username,
+            private_token=self.private_token,
+            public_token=self.public_token,
+            user_id=self.user_id,
+            settings=self.settings.to_dict() if self.settings is not None else None,
+            timeout=self.timeout,
+            retries=self.retries,
+        )
+
+    @classmethod
+    def from_session(cls, snapshot: SessionSnapshot, **kwargs) -> 'ThreadsApi':
+        """
+        Creates a client from a session snapshot without logging in.
+
+        The client has no password, so it never starts a login of its own and an
+        expired token surfaces as LoginRequiredError.
+
+        Parameters:
+            snapshot (SessionSnapshot): The snapshot from export_session.
+            **kwargs: Additional keyword arguments for ThreadsApi.
+
+        Returns:
+            ThreadsApi: The client.
+        """
+
+        token_store = MemoryTokenStore()
+        if snapshot.private_token is not None:
+            token_store.set(snapshot.username, snapshot.private_token)
+
+        kwargs.setdefault('verify_window', 0)
+        api = cls(
+            username=snapshot.username,
+            timeout=snapshot.timeout,
+            retries=snapshot.retries,
+            settings_file="",
+            token_store=token_store,
+            **kwargs
+        )
+        api.settings = Settings.from_dict(snapshot.settings) if snapshot.settings is not None else None
+        api.auth.settings = api.settings
+        api.private_token = snapshot.private_token
+        api.public_token = snapshot.public_token
+        api._public_token_at = time.time()
+        api.user_id = snapshot.user_id
+        api.is_logged_in = snapshot.private_token is not None
+        return api
+
+    def _settings_lock(self, shared: bool = False):
+        """
+        Internal method to get an advisory lock shared with every process using the same settings file.
+
+        Parameters:
+            shared (bool, optional): If True, take a shared (read) lock. Default is False.
+
+        Returns:
+            A context manager holding the lock.
+        """
+
+        if not self.settings_file:
+            return nullcontext()
+        return file_lock(self.settings_file, shared=shared)
+
     def _save_settings(self):
         """
-        Internal method to save settings to a file.
+        Internal method to save settings to a file atomically.
         """
 
-        with open(self.settings_file, 'w') as file:
-            file.write(json.dumps(self.settings.to_dict(), indent=4))
+        if not self.settings_file:
+            return
+
+        with self._settings_lock():
+            atomic_write(self.settings_file, json.dumps(self.settings.to_dict(), indent=4).encode())
+            self._settings_version = file_version(self.settings_file)
 
     def _load_settings(self):
         """
         Internal method to load settings from a file.
         """
 
-        if os.path.exists(self.settings_file):
+        with self._settings_lock(shared=True):
+            self._read_settings()
+
+    def _read_settings(self):
+        """
+        Internal method to read the settings file. The caller must hold the settings lock.
+        """
+
+        self._settings_version = None
+        if self.settings_file and os.path.exists(self.settings_file):
             with open(self.settings_file, 'r') as file:
                 self.settings = Settings.from_dict(json.loads(file.read()))
+            self._settings_version = file_version(self.settings_file)
         else:
             self.settings = None 
+
+    def _reload_settings_if_changed(self, locked: bool = False) -> bool:
+        """
+        Internal method to pick up settings written by another process since they were last loaded or saved.
+
+        Parameters:
+            locked (bool, optional): If True, the caller already holds the settings lock. Default is False.
+
+        Returns:
+            bool: True if the settings were reloaded.
+        """
+
+        if not self.settings_file or file_version(self.settings_file) == self._settings_version:
+            return False
+
+        if locked:
+            self._read_settings()
+        else:
+            self._load_settings()
+        if self.settings is not None:
+            self.auth.settings = self.settings
+        return True
+
+    def _refresh_private_token(self, stale_token: Optional[str]) -> str:
+        """
+        Internal method to get a token newer than stale_token. Only one process sharing the settings
+        file logs in at a time, the others wait and reuse the token it stored.
+
+        Parameters:
+            stale_token (str): The token known to be rejected.
+
+        Returns:
+            str: The new private token.
+        """
+
+        with self._settings_lock():
+            self._reload_settings_if_changed(locked=True)
+            token = self.auth.get_instagram_api_token()
+            if token is not None and token != stale_token:
+                return token
+            return self.auth.get_instagram_api_token(refresh=True)
     
-    def _create_session(self) -> requests.Session:
+    def _create_session(self, retries: Optional[int] = None) -> requests.Session:
         """
         Internal method to create a requests session with retry mechanism.
 
+        Parameters:
+            retries (int, optional): The number of retries. Default is the client setting.
+
         Returns:
             requests.Session: The requests session object.
         """
 
         session = requests.Session()
         retry_strategy = Retry(
-            total=self.retries,
-            backoff_factor="0.5",
+            total=self.retries if retries is None else retries,
+            backoff_factor=0.5,
             status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST", "PUT", "DELETE"]
+            allowed_methods=["GET", "POST", "PUT", "DELETE"],
+            # Hand the last response back so throttling can be told apart from other errors
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=self.max_connections,
+            pool_maxsize=self.max_connections
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         session.timeout = self.timeout
         return session
 
-    def _request(self, method, url, **kwargs) -> requests.Response:
+    def _index_threads(self, threads: List[Thread]) -> List[Thread]:
+        """
+        Internal method to add fetched threads to the caption index, if one is set.
+
+        Parameters:
+            threads (List[Thread]): The fetched threads.
+
+        Returns:
+            List[Thread]: The same threads.
+        """
+
+        if self.caption_index is not None:
+            self.caption_index.add_threads(threads)
+        return threads
+
+    def _request(self, method, url, replay_on_auth: bool = True, session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
         """
         Internal method to make a HTTP request and handle exceptions.
 
+        A private request rejected with 401 or login_required refreshes the token once and is replayed.
+
         Parameters:
             method (str): The HTTP method (GET, POST, PUT, DELETE).
             url (str): The URL to make the request.
+            replay_on_auth (bool, optional): If True, refresh the token and replay on an expired session. Default is True.
+            session (requests.Session, optional): The session to send the request with. Default is the client session.
             **kwargs: Additional keyword arguments for the request.
 
         Returns:
             requests.Response: The response object.
+
+        Raises:
+            RateLimitedError: If the request was throttled.
+            ChallengeRequiredError: If the account has to pass a challenge.
+            LoginRequiredError: If the session has expired.
         """
 
         try:
-            response = self.session.request(method, url, **kwargs)
+            response = (session or self.session).request(method, url, **kwargs)
             response.raise_for_status()
             return response
+        except HTTPError as exception:
+            try:
+                raise_for_api_error(exception.response)
+            except LoginRequiredError:
+                headers = kwargs.get('headers') or {}
+                if not replay_on_auth or 'Authorization' not in headers or self.auth.password is None:
+                    raise
+                stale_token = headers['Authorization'].split("Bearer IGT:2:")[-1]
+                self.refresh_token(stale_token)
+                headers['Authorization'] = f'Bearer IGT:2:{self.private_token}'
+                return self._request(method, url, replay_on_auth=False, session=session, **kwargs)
+            print(f"Error: {exception}")
+            return None
         except RequestException as exception:
             print(f"Error: {exception}")
             return None
@@ -159,12 +452,16 @@ class ThreadsApi:
             bool: True if login is successful, False otherwise.
         """
 
-        response = self._request(
-            method='GET',
-            url = f"{ENDPOINTS.INSTA_API_BASE}/users/{self.auth.username}/usernameinfo/",
-            headers=self.get_private_headers
-        )
-        data = response.json()
+        try:
+            response = self._request(
+                method='GET',
+                url = f"{ENDPOINTS.INSTA_API_BASE}/users/{self.auth.username}/usernameinfo/",
+                headers=self.get_private_headers,
+                replay_on_auth=False
+            )
+            data = response.json()
+        except (LoginRequiredError, ChallengeRequiredError) as error:
+            data = error.data
 
         if any(
             (
@@ -188,30 +485,139 @@ class ThreadsApi:
         return True
 
 
-    def login(self) -> bool:
+    def _trusts_stored_token(self) -> bool:
+        """
+        Internal method to check whether the stored token was verified recently enough to skip verification.
+
+        Returns:
+            bool: True if the token can be used without a verification request.
+        """
+
+        return (
+            self.verify_window > 0 and
+            self.private_token is not None and
+            self.settings is not None and
+            self.settings.user_id is not None and
+            time.time() - self.settings.verified_at < self.verify_window
+        )
+
+    def login(self, trust_stored: bool = True) -> bool:
         """
         Logs in the user and obtains the private API token.
 
+        Parameters:
+            trust_stored (bool, optional): If True, a token verified within verify_window is used without
+                a verification request. It is verified lazily by the first rejected request. Default is True.
+
         Returns:
             bool: True if login is successful, False otherwise.
         """
 
-        self.private_token = self.auth.get_instagram_api_token()
-        if not self._verify_login():
-            self.private_token = self.auth.get_instagram_api_token(refresh=True)
+        # Serialized with refresh_token so concurrent threads never see a half-finished login
+        with self._auth_lock:
+            self._reload_settings_if_changed()
+            self.private_token = self.auth.get_instagram_api_token()
+            if trust_stored and self._trusts_stored_token():
+                self.user_id = self.settings.user_id
+                self.is_logged_in = True
+                return self.is_logged_in
+
             if not self._verify_login():
-                raise Exception("Login failed :(")
+                self.private_token = self._refresh_private_token(self.private_token)
+                if not self._verify_login():
+                    raise Exception("Login failed :(")
+                else:
+                    self.is_logged_in = True
             else:
                 self.is_logged_in = True
-        else:
-            self.is_logged_in = True
 
-        self.settings = self.auth.get_settings()
-        if self.is_logged_in and self.settings is not None:
-            self._save_settings()
+            self.settings = self.auth.get_settings()
+            if self.is_logged_in and self.settings is not None:
+                self.settings.verified_at = time.time()
+                self.settings.user_id = self.user_id
+                self._save_settings()
 
-        return self.is_logged_in
+            return self.is_logged_in
     
+    @property
+    def token_age(self) -> Optional[float]:
+        """
+        Property to get the age of the private token in seconds.
+
+        Returns:
+            float or None: The token age, or None if it is unknown.
+        """
+
+        issued_at = self.auth.token_issued_at
+        if issued_at is None and self.settings is not None:
+            issued_at = self.settings.last_login or self.settings.verified_at or None
+        return time.time() - issued_at if issued_at else None
+
+    def refresh_token(self, stale_token: Optional[str] = None) -> str:
+        """
+        Refreshes the private token with a full login. Concurrent callers share one refresh.
+
+        Parameters:
+            stale_token (str, optional): The token the caller saw rejected. If another thread has already
+                replaced it, that token is returned without logging in again. Default is the current token.
+
+        Returns:
+            str: The current private token.
+        """
+
+        stale_token = self.private_token if stale_token is None else stale_token
+        with self._auth_lock:
+            if self.private_token != stale_token and self.private_token is not None:
+                return self.private_token
+
+            self.private_token = self._refresh_private_token(stale_token)
+            self.is_logged_in = True
+            settings = self.auth.get_settings()
+            if settings is not None:
+                self.settings = settings
+                self.settings.verified_at = time.time()
+                if self.user_id is not None:
+                    self.settings.user_id = self.user_id
+                self._save_settings()
+            return self.private_token
+
+    def start_token_refresher(self, max_age: float = 24 * 60 * 60, check_interval: float = 600) -> threading.Thread:
+        """
+        Starts a daemon thread that refreshes the private token before it gets older than max_age.
+
+        Parameters:
+            max_age (float, optional): The token age in seconds that triggers a refresh. Default is 24 hours.
+            check_interval (float, optional): How often to check the token age in seconds. Default is 600.
+
+        Returns:
+            threading.Thread: The refresher thread.
+        """
+
+        def refresher():
+            while not self._refresher_stop.wait(check_interval):
+                age = self.token_age
+                if self.is_logged_in and age is not None and age >= max_age:
+                    try:
+                        self.refresh_token()
+                    except Exception as exception:
+                        print(f"Error: {exception}")
+
+        self.stop_token_refresher()
+        self._refresher_stop.clear()
+        self._refresher = threading.Thread(target=refresher, name='threadspy-token-refresher', daemon=True)
+        self._refresher.start()
+        return self._refresher
+
+    def stop_token_refresher(self):
+        """
+        Stops the background token refresher, if it is running.
+        """
+
+        if self._refresher is not None:
+            self._refresher_stop.set()
+            self._refresher.join()
+            self._refresher = None
+
     def get_user_id(self, username: str, instagram: bool = False) -> int:
         """
         Gets the user ID from either Threads or Instagram for the corresponding username.
@@ -236,6 +642,70 @@ class ThreadsApi:
         
         return uid
 
+    def lookup_users(self, usernames: Iterable[str], max_workers: int = 8, threads: bool = True) -> Iterator[UserLookup]:
+        """
+        Resolves usernames to their ID, profile and threads with the lookups of different users overlapping.
+
+        Every stage of every user shares one pool of max_workers requests. As soon as the ID of a user
+        is known, its profile and threads are fetched side by side while the next users are resolved.
+
+        Parameters:
+            usernames (Iterable[str]): The usernames to look up.
+            max_workers (int, optional): The maximum number of concurrent requests. Default is 8.
+            threads (bool, optional): If True, also fetch the threads of each user. Default is True.
+
+        Returns:
+            Iterator[UserLookup]: One result per username as it completes. A failed stage sets error.
+        """
+
+        usernames = iter(usernames)
+        lookups: Dict[int, UserLookup] = {}
+        pending: Dict[int, int] = {}
+        stages = {}
+        counter = itertools.count()
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='threadspy-lookup') as executor:
+            def admit():
+                # Keep enough users in the pipeline to fill every stage, without reading the whole input
+                while len(lookups) < 2 * max_workers:
+                    username = next(usernames, None)
+                    if username is None:
+                        return
+                    index = next(counter)
+                    lookups[index] = UserLookup(username=username)
+                    pending[index] = 1
+                    stages[executor.submit(self.get_user_id, username)] = (index, 'user_id')
+
+            admit()
+            while stages:
+                done, _ = wait(stages, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, stage = stages.pop(future)
+                    lookup = lookups[index]
+                    pending[index] -= 1
+                    try:
+                        result = future.result()
+                    except Exception as exception:
+                        lookup.error = lookup.error or exception
+                        result = None
+
+                    if stage == 'user_id' and result is not None:
+                        lookup.user_id = result
+                        stages[executor.submit(self.get_user_profile, result)] = (index, 'profile')
+                        pending[index] += 1
+                        if threads:
+                            stages[executor.submit(self.get_user_threads_auth, result)] = (index, 'threads')
+                            pending[index] += 1
+                    elif stage == 'profile':
+                        lookup.profile = result
+                    elif stage == 'threads':
+                        lookup.threads = result
+
+                    if pending[index] == 0:
+                        del lookups[index], pending[index]
+                        yield lookup
+                admit()
+
     def get_current_user_id(self) -> int:
         """
         Gets the ID of the current user.
@@ -348,7 +818,12 @@ class ThreadsApi:
             headers=self.get_private_headers,
         )
 
-        return ThreadResponse.from_dict(response.json(), self)
+        thread_response = ThreadResponse.from_dict(response.json(), self)
+        if thread_response.containing_thread is not None:
+            self._index_threads([thread_response.containing_thread])
+        self._index_threads(thread_response.reply_threads)
+
+        return thread_response
 
     def get_user_threads(self, user_id: int) -> List[Thread]:
         """
@@ -361,33 +836,51 @@ class ThreadsApi:
             List[Thread]: A list of Thread objects.
         """
 
-        new_headers = self.get_public_headers
-
-        new_headers.update({
-            'sec-fetch-dest': 'empty',
-            'sec-fetch-mode': 'cors',
-            'sec-fetch-site': 'same-origin',
-            'x-fb-friendly-name': 'BarcelonaProfileThreadsTabQuery'
-        })
-        
-        payload = {
-                'lsd': self.public_token,
-                'variables': json.dumps(
-                    {
-                        'userID': user_id,
-                    }
-                ),
-                'doc_id': '6232751443445612'
-            }
-        response = self._request(
-            method='POST',
-            url=ENDPOINTS.THREADS_API_BASE,
-            headers=new_headers,
-            data=payload
+        response = self._public_graphql(
+            friendly_name='BarcelonaProfileThreadsTabQuery',
+            variables={'userID': user_id},
+            doc_id='6232751443445612'
         )
 
-        return [Thread.from_dict(thread_data, self) for thread_data in response.json().get('threads', [])]
+        return self._index_threads([Thread.from_dict(thread_data, self) for thread_data in response.json().get('threads', [])])
         
+    def get_users_threads(self, user_ids: Iterable[int], max_workers: int = 8) -> Iterator[Tuple[int, Union[List[Thread], Exception]]]:
+        """
+        Gets the threads of many users through the logged-out GraphQL endpoint, so no account quota is used.
+
+        All requests share one LSD token and the client's connection pool. At most max_workers
+        requests are in flight at a time, and results are yielded as they finish.
+
+        Parameters:
+            user_ids (Iterable[int]): The user IDs.
+            max_workers (int, optional): The maximum number of concurrent requests. Default is 8.
+
+        Returns:
+            Iterator[Tuple[int, Union[List[Thread], Exception]]]: The user ID and its threads, or the
+                exception raised while fetching them.
+        """
+
+        # Fetch the token once up front instead of racing for it in every worker
+        self.get_public_headers
+        user_ids = iter(user_ids)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='threadspy-timeline') as executor:
+            in_flight = {}
+            while True:
+                for user_id in user_ids:
+                    in_flight[executor.submit(self.get_user_threads, user_id)] = user_id
+                    if len(in_flight) >= max_workers:
+                        break
+                if not in_flight:
+                    return
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    user_id = in_flight.pop(future)
+                    try:
+                        yield user_id, future.result()
+                    except Exception as exception:
+                        yield user_id, exception
+
     def get_user_threads_auth(self, user_id: int) -> List[Thread]:
         """
         Gets the threads associated with a user with provided user ID using authenticated request.
@@ -405,7 +898,7 @@ class ThreadsApi:
             headers=self.get_private_headers
         )
 
-        return [Thread.from_dict(thread_data, self) for thread_data in response.json().get('threads', [])]
+        return self._index_threads([Thread.from_dict(thread_data, self) for thread_data in response.json().get('threads', [])])
 
     def get_user_followers(self, user_id: int) -> UserFollowersResponse:
         """
@@ -780,15 +1273,18 @@ class ThreadsApi:
 
         return response.json().get('status') == 'ok'
 
-    def create(self, text: str, url: str=None, image: Optional[Union[str, List]]=None, reply_to: int=None) -> dict:
+    def create(self, text: str, url: str=None, image: Optional[Union[ImageSource, List[ImageSource]]]=None, reply_to: int=None, max_workers: int=4, progress: Optional[Callable[[int, int], None]]=None) -> dict:
         """
         Creates a new thread.
 
         Parameters:
             text (str): The text content of the thread.
             url (str, optional): The URL to include in the thread. Default is None.
-            image (str or list, optional): The image or list of images to include in the thread. Default is None.
+            image (optional): The image or list of images to include in the thread, each a URL, file path,
+                bytes, memoryview or binary file object. Default is None.
             reply_to (int, optional): The ID of the thread to reply to. Default is None.
+            max_workers (int, optional): The number of carousel images uploaded at the same time. Default is 4.
+            progress (callable, optional): Called with (bytes committed, total bytes) as each image uploads.
 
         Returns:
             dict: The response JSON containing the details of the newly created thread.
@@ -831,24 +1327,29 @@ class ThreadsApi:
             parameters_as_string['text_post_app_info']['link_attachment_url'] = url
 
         elif url is None and image is not None:
-            if len(image) == 1:
-                image = image[0]
-            elif len(image) < 1:
-                raise Exception("No image provided")
+            if isinstance(image, list):
+                if len(image) == 1:
+                    image = image[0]
+                elif len(image) < 1:
+                    raise Exception("No image provided")
 
-            if isinstance(image, str):
+            if not isinstance(image, list):
                 endpoint = "/media/configure_text_post_app_feed/"           
-                upload_id = self._upload_image(image)
+                upload_id = self._upload_image(image, progress)
                 if upload_id is None:
                     return False
                 parameters_as_string["upload_id"] = upload_id
                 parameters_as_string["scene_capture_type"] = ""
-            elif isinstance(image, list):
+            else:
                 endpoint = "/media/configure_text_post_app_sidecar/"
                 parameters_as_string['client_sidecar_id'] = int(time.time() * 1000)
                 parameters_as_string["children_metadata"] = []
-                for i in image:
-                    upload_id = self._upload_image(i)
+                try:
+                    upload_ids = self._upload_images(image, max_workers=max_workers, progress=progress)
+                except Exception as exception:
+                    print(f"Error: {exception}")
+                    return False
+                for upload_id in upload_ids:
                     parameters_as_string["children_metadata"] += [{
                         'upload_id': upload_id,
                         'source_type': '4',
@@ -870,12 +1371,60 @@ class ThreadsApi:
 
         return response.json()
     
-    def _upload_image(self, url: str) -> int:
+    def _upload_images(
+            self,
+            images: List[ImageSource],
+            max_workers: int = 4,
+            attempts: int = 3,
+            progress: Optional[Callable[[int, int], None]] = None
+    ) -> List[int]:
         """
-        Internal method to upload an image.
+        Internal method to upload several images concurrently, retrying each one on its own.
+
+        Parameters:
+            images (List[ImageSource]): The images to upload.
+            max_workers (int, optional): The maximum number of concurrent uploads. Default is 4.
+            attempts (int, optional): The number of tries per image. Default is 3.
+            progress (callable, optional): Called with (bytes committed, total bytes) for each image.
+
+        Returns:
+            List[int]: The upload IDs, in the order of the images.
+
+        Raises:
+            Exception: If an image still fails after all attempts.
+        """
+
+        def upload(image: ImageSource) -> int:
+            # A file object has to be rewound before it can be sent again
+            rewindable = not hasattr(image, 'read') or (hasattr(image, 'seekable') and image.seekable())
+            position = image.tell() if hasattr(image, 'read') and rewindable else None
+            for attempt in range(attempts):
+                if attempt:
+                    time.sleep(self.UPLOAD_RETRY_DELAY * 2 ** (attempt - 1))
+                    if position is not None:
+                        image.seek(position)
+                try:
+                    upload_id = self._upload_image(image, progress)
+                    if upload_id is not None:
+                        return upload_id
+                    error = Exception("No upload ID returned")
+                except (ValueError, RequestException) as exception:
+                    error = exception
+                if not rewindable:
+                    break
+            raise Exception(f"Image upload failed: {error}")
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(images))), thread_name_prefix='threadspy-upload') as executor:
+            return list(executor.map(upload, images))
+
+    def _upload_image(self, image: ImageSource, progress: Optional[Callable[[int, int], None]] = None) -> int:
+        """
+        Internal method to upload an image. Local images are streamed from disk or memory without being copied.
 
         Parameters:
-            url (str): The URL or local file path of the image.
+            image (str, bytes, bytearray, memoryview or file object): The URL or local file path of the image,
+                the image bytes, or a binary file object.
+            progress (callable, optional): Called with (bytes committed, total bytes) as the upload advances.
 
         Returns:
             int: The upload ID of the image.
@@ -892,34 +1441,57 @@ class ThreadsApi:
              "{2,6}\\b([-a-zA-Z0-9@:%" +
              "._\\+~#?&//=]*)")
 
-        file_data = None
-        file_length = None
-        mime_type = 'image/jpeg'
         waterfall_id = str(uuid4())
 
-        is_url = True if re.match(url_pattern, url) is not None else False
-        is_file_path = True if os.path.isfile(url) else False
+        is_url = isinstance(image, str) and re.match(url_pattern, image) is not None
+        is_file_path = isinstance(image, str) and os.path.isfile(image)
 
-        if is_file_path:
-            with open(url, 'rb') as file:
-                file_data = file.read()
-                file_length = len(file_data)
-
-            mime_type = mimetypes.guess_type(url)[0]
-
-        elif is_url:
-            response = self._request('GET', url, stream=True, timeout=2)
+        if is_url and not is_file_path:
+            response = self._request('GET', image, stream=True, timeout=2)
             content_type = response.headers.get("Content-Type")
             response.raw.decode_content = True
-            mime_type = content_type.split(";")[0] if content_type else mime_type
+            mime_type = content_type.split(";")[0] if content_type else None
 
             file_data = response.content
-            file_length = len(response.content)
+            source = UploadSource(MemoryReader(file_data), len(file_data), mime_type)
         else:
-            raise ValueError('Wrong Image URL provided.')
+            source = open_upload_source(image)
+
+        if source.length == 0:
+            source.close()
+            raise ValueError("File is empty")
 
-        if file_data is None and file_length is None:
-           raise ValueError("File is empty")
+        with source:
+            return self._rupload(source, upload_id, upload_name, waterfall_id, progress=progress)
+
+    def _rupload(
+            self,
+            source: UploadSource,
+            upload_id: int,
+            upload_name: str,
+            waterfall_id: str,
+            chunk_size: Optional[int] = None,
+            progress: Optional[Callable[[int, int], None]] = None,
+            attempts: int = 3
+    ) -> int:
+        """
+        Internal method to send an image to the rupload endpoint, in chunks if chunk_size is set.
+
+        A failed request asks the endpoint for the committed offset and continues from there,
+        so only the missing bytes are sent again.
+
+        Parameters:
+            source (UploadSource): The image body.
+            upload_id (int): The client-side upload ID.
+            upload_name (str): The entity name of the upload.
+            waterfall_id (str): The waterfall ID of the upload.
+            chunk_size (int, optional): The bytes per request. Default is upload_chunk_size, or the whole image.
+            progress (callable, optional): Called with (bytes committed, total bytes) after every chunk.
+            attempts (int, optional): The number of failed requests before giving up. Default is 3.
+
+        Returns:
+            int: The upload ID of the image.
+        """
 
         parameters_as_string = {
             'media_type': 1,
@@ -948,22 +1520,59 @@ class ThreadsApi:
             'Accept-Encoding': 'gzip',
             'X-Instagram-Rupload-Params': json.dumps(parameters_as_string),
             'X_FB_PHOTO_WATERFALL_ID': waterfall_id,
-            'X-Entity-Type': mime_type,
-            'Offset': '0',
+            'X-Entity-Type': source.mime_type,
             'X-Entity-Name': upload_name,
-            'X-Entity-Length': str(file_length),
+            'X-Entity-Length': str(source.length),
             'Content-Type': 'application/octet-stream',
-            'Content-Length': str(file_length),
         })
+        url = f'{ENDPOINTS.INSTA_BASE}/rupload_igphoto/{upload_name}'
+
+        # Retrying a partly sent body is done here from the committed offset, not by the Retry adapter
+        chunk_size = chunk_size or self.upload_chunk_size or source.length
+        offset = 0
+        failures = 0
+        while True:
+            try:
+                body = source.chunk(offset, chunk_size, retain=chunk_size < source.length)
+                chunk_headers = dict(headers, Offset=str(offset))
+                chunk_headers['Content-Length'] = str(len(body))
+                response = self._request(
+                    method='POST',
+                    url=url,
+                    data=body,
+                    headers=chunk_headers,
+                    session=self._upload_session,
+                )
+            except ValueError:
+                raise ValueError('Image uploading has been failed. Please, create GitHub issue')
+
+            if response is not None and response.status_code in (HTTPStatus.OK, HTTPStatus.CREATED):
+                offset += len(body)
+                if progress is not None:
+                    progress(offset, source.length)
+                if offset >= source.length:
+                    return response.json().get('upload_id')
+                continue
+
+            failures += 1
+            if failures >= attempts:
+                raise ValueError('Image uploading has been failed. Please, create GitHub issue')
+            offset = self._rupload_offset(url, headers)
+
+    def _rupload_offset(self, url: str, headers: dict) -> int:
+        """
+        Internal method to ask the rupload endpoint how many bytes of an upload it has committed.
 
-        response = self._request(
-            method='POST',
-            url=f'https://www.instagram.com/rupload_igphoto/{upload_name}',
-            data=file_data,
-            headers=headers,
-        )
+        Parameters:
+            url (str): The rupload URL of the upload.
+            headers (dict): The rupload headers of the upload.
 
-        if response.status_code not in (HTTPStatus.OK, HTTPStatus.CREATED):
-            raise ValueError('Image uploading has been failed. Please, create GitHub issue')
+        Returns:
+            int: The committed offset, 0 if it is unknown.
+        """
 
-        return response.json().get('upload_id')
\ No newline at end of file
+        response = self._request(method='GET', url=url, headers=headers, session=self._upload_session)
+        try:
+            return int(response.json().get('offset', 0))
+        except (AttributeError, TypeError, ValueError):
+            return 0
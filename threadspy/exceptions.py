@@ -0,0 +1,56 @@
+from typing import Optional
+
+import requests
+
+class ThreadsApiError(Exception):
+    """
+    Base class for errors reported by the Threads or Instagram API.
+    """
+
+    def __init__(self, message: str, response: Optional[requests.Response] = None):
+        super().__init__(message)
+        self.response = response
+        self.status_code = response.status_code if response is not None else None
+        try:
+            data = response.json() if response is not None else {}
+        except ValueError:
+            data = {}
+        self.data = data if isinstance(data, dict) else {}
+
+class LoginRequiredError(ThreadsApiError):
+    """
+    The private token is missing, expired or was revoked.
+    """
+
+class RateLimitedError(ThreadsApiError):
+    """
+    The account or client is being throttled.
+    """
+
+class ChallengeRequiredError(ThreadsApiError):
+    """
+    The account has to pass a challenge or checkpoint before it can be used again.
+    """
+
+class NoHealthyAccountError(Exception):
+    """
+    Every account of an AccountPool is throttled, challenged or logged out.
+    """
+
+def raise_for_api_error(response: requests.Response):
+    """
+    Raise the matching ThreadsApiError if a response reports throttling, a challenge or an expired session.
+
+    Parameters:
+        response (requests.Response): The response to inspect.
+    """
+
+    error = ThreadsApiError('', response)
+    message = str(error.data.get('message', ''))
+
+    if response.status_code == 429 or 'Please wait' in message or 'feedback_required' in message:
+        raise RateLimitedError(message or 'Too many requests', response)
+    if 'challenge_required' in message or 'checkpoint_required' in message:
+        raise ChallengeRequiredError(message, response)
+    if response.status_code == 401 or message == 'login_required':
+        raise LoginRequiredError(message or 'Login required', response)
@@ -0,0 +1,186 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from threadspy.utils import TRACKED_PROFILE_FIELDS, file_lock, profile_snapshot
+
+@dataclass
+class ProfileSeries:
+    timestamps: List[float] = field(default_factory=list)
+    offsets: List[int] = field(default_factory=list)
+    state: dict = field(default_factory=dict)
+    size: int = 0
+
+class ProfileHistory:
+    def __init__(self, directory: str = "profile_history", fields: Tuple[str, ...] = TRACKED_PROFILE_FIELDS):
+        """
+        Initialize the ProfileHistory object.
+
+        Every user gets an append-only file holding one compact JSON line per change,
+        ``[timestamp, {field: new_value}]``. The first line is the full starting snapshot.
+        The timestamp and byte offset of each line are indexed in memory, so range queries
+        seek straight to the first matching change. Appends are locked, so several instances
+        or processes can share a directory.
+
+        Parameters:
+            directory (str, optional): The directory to store history files in. Default is "profile_history".
+            fields (tuple, optional): The ThreadsUser fields to track.
+        """
+
+        self.directory = directory
+        self.fields = fields
+        self._series: Dict[str, ProfileSeries] = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, pk: Any) -> str:
+        return os.path.join(self.directory, f'{pk}.jsonl')
+
+    def _load(self, pk: Any) -> ProfileSeries:
+        """
+        Internal method to get the in-memory index of a user, indexing records that other
+        instances or processes appended since the last call.
+
+        Returns:
+            ProfileSeries: The in-memory index and latest state of the user.
+        """
+
+        key = str(pk)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = ProfileSeries()
+
+        path = self._path(pk)
+        if os.path.exists(path) and os.path.getsize(path) > series.size:
+            with open(path, 'rb') as file:
+                file.seek(series.size)
+                offset = series.size
+                for line in file:
+                    if not line.endswith(b'\n'):
+                        # Partial record from a crash or a write in progress
+                        break
+                    timestamp, delta = json.loads(line)
+                    series.timestamps.append(timestamp)
+                    series.offsets.append(offset)
+                    series.state.update(delta)
+                    offset += len(line)
+                series.size = offset
+        return series
+
+    def record(self, user: Any, timestamp: Optional[float] = None) -> dict:
+        """
+        Record a fetched profile, storing only the fields that changed since the last record.
+
+        Parameters:
+            user (ThreadsUser): The profile returned by get_user_profile.
+            timestamp (float, optional): The time of the poll. Default is time.time().
+
+        Returns:
+            dict: The changed fields and their new values, empty if nothing changed.
+        """
+
+        timestamp = time.time() if timestamp is None else timestamp
+        snapshot = profile_snapshot(user, self.fields)
+
+        path = self._path(user.pk)
+        with self._lock, file_lock(path):
+            series = self._load(user.pk)
+            delta = {
+                key: value for key, value in snapshot.items()
+                if key not in series.state or series.state[key] != value
+            }
+            if not delta:
+                return delta
+            if series.timestamps and timestamp < series.timestamps[-1]:
+                raise ValueError("History records must be added in time order")
+
+            line = json.dumps([timestamp, delta], separators=(',', ':')).encode() + b'\n'
+            with open(path, 'ab') as file:
+                if file.tell() != series.size:
+                    # Writers hold the file lock, so bytes after the last complete line are a torn write
+                    file.truncate(series.size)
+                file.write(line)
+
+            series.timestamps.append(timestamp)
+            series.offsets.append(series.size)
+            series.size += len(line)
+            series.state.update(delta)
+            return delta
+
+    def changes(self, pk: Any, start: Optional[float] = None, end: Optional[float] = None) -> List[Tuple[float, dict]]:
+        """
+        Get the changes of a user within a time range.
+
+        Parameters:
+            pk (int or str): The user ID.
+            start (float, optional): The inclusive start timestamp. Default is the first record.
+            end (float, optional): The inclusive end timestamp. Default is the last record.
+
+        Returns:
+            List[Tuple[float, dict]]: The (timestamp, changed fields) pairs in time order.
+        """
+
+        with self._lock:
+            series = self._load(pk)
+            first = 0 if start is None else bisect_left(series.timestamps, start)
+            last = len(series.timestamps) if end is None else bisect_right(series.timestamps, end)
+            if first >= last:
+                return []
+            begin = series.offsets[first]
+            stop = series.offsets[last] if last < len(series.offsets) else series.size
+
+        with open(self._path(pk), 'rb') as file:
+            file.seek(begin)
+            data = file.read(stop - begin)
+        return [tuple(json.loads(line)) for line in data.splitlines()]
+
+    def state_at(self, pk: Any, timestamp: float) -> dict:
+        """
+        Rebuild the tracked fields of a user as they were at a point in time.
+
+        Parameters:
+            pk (int or str): The user ID.
+            timestamp (float): The point in time.
+
+        Returns:
+            dict: The field values, empty if nothing was recorded before the timestamp.
+        """
+
+        state = {}
+        for _, delta in self.changes(pk, end=timestamp):
+            state.update(delta)
+        return state
+
+    def field_history(self, pk: Any, name: str, start: Optional[float] = None, end: Optional[float] = None) -> List[Tuple[float, Any]]:
+        """
+        Get the values a single field took within a time range.
+
+        Parameters:
+            pk (int or str): The user ID.
+            name (str): The tracked field name, e.g. "follower_count".
+            start (float, optional): The inclusive start timestamp.
+            end (float, optional): The inclusive end timestamp.
+
+        Returns:
+            List[Tuple[float, Any]]: The (timestamp, value) pairs where the field changed.
+        """
+
+        return [(timestamp, delta[name]) for timestamp, delta in self.changes(pk, start, end) if name in delta]
+
+    def latest(self, pk: Any) -> dict:
+        """
+        Get the most recently recorded state of a user.
+
+        Parameters:
+            pk (int or str): The user ID.
+
+        Returns:
+            dict: The latest field values.
+        """
+
+        with self._lock:
+            return dict(self._load(pk).state)
@@ -0,0 +1,322 @@
+import hashlib
+import json
+import mimetypes
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from threadspy.models import ImageVersions2, Post, ThreadsUser
+
+# CDN query parameters that sign or expire a URL without changing the file it points to
+SIGNATURE_PARAMETERS = ('oh', 'oe')
+
+def _get(item: Any, key: str) -> Any:
+    return item.get(key) if isinstance(item, dict) else getattr(item, key, None)
+
+def best_candidate(
+        candidates: Optional[Iterable[Any]],
+        max_width: Optional[int] = None,
+        max_height: Optional[int] = None,
+        max_pixels: Optional[int] = None,
+) -> Optional[Any]:
+    """
+    Pick the largest image candidate that fits the given limits.
+
+    If no candidate fits, the smallest one is returned instead so that something is always downloaded.
+
+    Parameters:
+        candidates (Iterable): Candidate, ThreadsHdProfilePicVersion or raw dict objects.
+        max_width (int, optional): The maximum width in pixels.
+        max_height (int, optional): The maximum height in pixels.
+        max_pixels (int, optional): The maximum width * height.
+
+    Returns:
+        The chosen candidate, or None if there are no candidates with a URL.
+    """
+
+    candidates = [candidate for candidate in (candidates or []) if _get(candidate, 'url')]
+    if not candidates:
+        return None
+
+    def area(candidate):
+        return (_get(candidate, 'width') or 0) * (_get(candidate, 'height') or 0)
+
+    def fits(candidate):
+        width = _get(candidate, 'width') or 0
+        height = _get(candidate, 'height') or 0
+        return (
+            (max_width is None or width <= max_width) and
+            (max_height is None or height <= max_height) and
+            (max_pixels is None or width * height <= max_pixels)
+        )
+
+    fitting = [candidate for candidate in candidates if fits(candidate)]
+    if fitting:
+        return max(fitting, key=area)
+    return min(candidates, key=area)
+
+class MediaDownloader:
+    def __init__(
+            self,
+            directory: str = "media",
+            max_workers: int = 8,
+            max_width: Optional[int] = None,
+            max_height: Optional[int] = None,
+            max_pixels: Optional[int] = None,
+            timeout: int = 10,
+            chunk_size: int = 64 * 1024,
+            ignore_signatures: bool = True,
+    ):
+        """
+        Initialize the MediaDownloader object.
+
+        Files are stored once under ``objects/`` by the SHA-256 of their content. A URL to
+        file map is kept in ``urls.jsonl`` so repeated URLs never hit the network again.
+
+        Parameters:
+            directory (str, optional): The directory to store media in. Default is "media".
+            max_workers (int, optional): The maximum number of concurrent downloads. Default is 8.
+            max_width (int, optional): The maximum image width to pick. Default is no limit.
+            max_height (int, optional): The maximum image height to pick. Default is no limit.
+            max_pixels (int, optional): The maximum image area to pick. Default is no limit.
+            timeout (int, optional): The request timeout in seconds. Default is 10.
+            chunk_size (int, optional): The streaming chunk size in bytes. Default is 64 KiB.
+            ignore_signatures (bool, optional): If True, URLs that only differ in their CDN signature
+                parameters (oh, oe, _nc_*) share a cache entry. Parameters that pick the rendition,
+                such as stp, are kept. Default is True.
+        """
+
+        self.directory = directory
+        self.max_width = max_width
+        self.max_height = max_height
+        self.max_pixels = max_pixels
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.ignore_signatures = ignore_signatures
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='threadspy-media')
+
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self._cache: Dict[str, str] = {}
+        self._cache_path = os.path.join(directory, 'urls.jsonl')
+
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+        if os.path.exists(self._cache_path):
+            with open(self._cache_path, 'r') as file:
+                for line in file:
+                    if line.endswith('\n'):
+                        key, relative_path = json.loads(line)
+                        self._cache[key] = relative_path
+
+    def __enter__(self) -> 'MediaDownloader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Wait for running downloads and release the worker pool and connections.
+        """
+
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
+    def _cache_key(self, url: str) -> str:
+        if not self.ignore_signatures:
+            return url
+        parts = urlsplit(url)
+        query = [
+            (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if name not in SIGNATURE_PARAMETERS and not name.startswith('_nc_')
+        ]
+        return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+    def cached_path(self, url: str) -> Optional[str]:
+        """
+        Get the local path of a URL that was already downloaded.
+
+        Parameters:
+            url (str): The media URL.
+
+        Returns:
+            str or None: The local file path, or None if the URL is not cached.
+        """
+
+        relative_path = self._cache.get(self._cache_key(url))
+        if relative_path is None:
+            return None
+        path = os.path.join(self.directory, relative_path)
+        return path if os.path.exists(path) else None
+
+    def download(self, url: str) -> str:
+        """
+        Download a URL, or return the stored copy if it was downloaded before.
+
+        Parameters:
+            url (str): The media URL.
+
+        Returns:
+            str: The local file path.
+        """
+
+        return self.submit(url).result()
+
+    def submit(self, url: str) -> Future:
+        """
+        Schedule a download on the worker pool. Concurrent requests for the same URL share one download.
+
+        Parameters:
+            url (str): The media URL.
+
+        Returns:
+            Future: A future resolving to the local file path.
+        """
+
+        key = self._cache_key(url)
+        with self._lock:
+            path = self.cached_path(url)
+            if path is not None:
+                future = Future()
+                future.set_result(path)
+                return future
+
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self.executor.submit(self._fetch, url, key)
+                self._in_flight[key] = future
+        return future
+
+    def download_many(self, urls: Iterable[str]) -> Dict[str, str]:
+        """
+        Download several URLs concurrently.
+
+        Parameters:
+            urls (Iterable[str]): The media URLs.
+
+        Returns:
+            Dict[str, str]: The local file path of every URL that downloaded successfully.
+        """
+
+        futures = {url: self.submit(url) for url in urls}
+        paths = {}
+        for url, future in futures.items():
+            try:
+                paths[url] = future.result()
+            except Exception as exception:
+                print(f"Error: {exception}")
+        return paths
+
+    def post_media_urls(self, post: Post) -> List[str]:
+        """
+        Get the best image or video URL of a post and of each carousel item.
+
+        Parameters:
+            post (Post): The post.
+
+        Returns:
+            List[str]: The chosen URLs.
+        """
+
+        urls = []
+        items = [post]
+        items += post.carousel_media or []
+        for item in items:
+            video_versions = _get(item, 'video_versions')
+            if video_versions:
+                # Videos are listed best first and carry no dimensions to rank by
+                urls.append(_get(video_versions[0], 'url'))
+                continue
+
+            image_versions = _get(item, 'image_versions2')
+            if isinstance(image_versions, dict):
+                image_versions = ImageVersions2.from_dict(image_versions)
+            if image_versions is not None:
+                candidate = best_candidate(image_versions.candidates, self.max_width, self.max_height, self.max_pixels)
+                if candidate is not None:
+                    urls.append(candidate.url)
+        return [url for url in urls if url]
+
+    def download_post(self, post: Post) -> List[str]:
+        """
+        Download the media of a post.
+
+        Parameters:
+            post (Post): The post.
+
+        Returns:
+            List[str]: The local file paths.
+        """
+
+        return list(self.download_many(self.post_media_urls(post)).values())
+
+    def download_profile_picture(self, user: ThreadsUser) -> Optional[str]:
+        """
+        Download the best HD profile picture of a user, falling back to profile_pic_url.
+
+        Parameters:
+            user (ThreadsUser): The user.
+
+        Returns:
+            str or None: The local file path, or None if the user has no picture.
+        """
+
+        candidate = best_candidate(user.hd_profile_pic_versions, self.max_width, self.max_height, self.max_pixels)
+        url = candidate.url if candidate is not None else user.profile_pic_url
+        return self.download(url) if url else None
+
+    def _fetch(self, url: str, key: str) -> str:
+        """
+        Internal method to stream a URL to a temporary file while hashing it, then move it into place.
+
+        Returns:
+            str: The local file path.
+        """
+
+        try:
+            digest = hashlib.sha256()
+            objects = os.path.join(self.directory, 'objects')
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type', '').split(';')[0]
+                extension = mimetypes.guess_extension(content_type) or os.path.splitext(urlsplit(url).path)[1]
+
+                file_descriptor, temp_path = tempfile.mkstemp(dir=objects, suffix='.part')
+                try:
+                    with os.fdopen(file_descriptor, 'wb') as file:
+                        for chunk in response.iter_content(chunk_size=self.chunk_size):
+                            digest.update(chunk)
+                            file.write(chunk)
+
+                    content_hash = digest.hexdigest()
+                    relative_path = os.path.join('objects', content_hash[:2], content_hash + extension)
+                    path = os.path.join(self.directory, relative_path)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    if os.path.exists(path):
+                        os.remove(temp_path)
+                    else:
+                        os.replace(temp_path, path)
+                except BaseException:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                    raise
+
+            with self._lock:
+                self._cache[key] = relative_path
+                with open(self._cache_path, 'a') as file:
+                    file.write(json.dumps([key, relative_path]) + '\n')
+            return path
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
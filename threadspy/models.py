@@ -758,4 +758,11 @@ class RepostData:
             repost_fbid=data.get('repost_fbid'),
             reposted_at=data.get('reposted_at'),
             status=data.get('status')
-        )
\ No newline at end of file
+        )
+@dataclass
+class UserLookup:
+    username: str
+    user_id: Optional[int] = None
+    profile: Optional[ThreadsUser] = None
+    threads: Optional[List[Thread]] = None
+    error: Optional[Exception] = None
@@ -0,0 +1,295 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from threadspy.client import ThreadsApi
+from threadspy.exceptions import ChallengeRequiredError, LoginRequiredError, NoHealthyAccountError, RateLimitedError
+from threadspy.utils import RateLimiter
+
+READ_METHODS = (
+    'get_user_id',
+    'get_user_id_from_instagram',
+    'get_user_id_from_threads',
+    'get_user_profile',
+    'search_user',
+    'get_thread',
+    'get_user_threads',
+    'get_user_threads_auth',
+    'get_user_followers',
+    'get_user_following',
+    'get_friendship_status',
+)
+
+WRITE_METHODS = (
+    'follow_user',
+    'unfollow_user',
+    'mute_user',
+    'unmute_user',
+    'restrict_user',
+    'unrestrict_user',
+    'block_user',
+    'unblock_user',
+    'like',
+    'unlike',
+    'repost',
+    'unrepost',
+    'delete',
+    'create',
+)
+
+@dataclass
+class PooledAccount:
+    username: str
+    api: ThreadsApi
+    limiter: RateLimiter
+    in_flight: int = 0
+    throttled: int = 0
+    cooldown_until: float = 0.0
+    challenged: bool = False
+
+    @property
+    def healthy(self) -> bool:
+        return not self.challenged and self.api.is_logged_in and time.time() >= self.cooldown_until
+
+class AccountPool:
+    def __init__(
+            self,
+            requests_per_minute: float = 60,
+            cooldown: float = 300,
+            max_cooldown: float = 3600,
+    ):
+        """
+        Initialize the AccountPool object.
+
+        Read requests go to the healthy account with the fewest requests in flight and the
+        most budget left. A throttled account is put on a cooldown that doubles each time
+        it is throttled again, and the request is retried on another account. Accounts that
+        hit a challenge are taken out until reset() is called. Write requests always use the
+        pinned writer account and count against its request budget like reads do.
+
+        Parameters:
+            requests_per_minute (float, optional): The default request budget of each account. Default is 60.
+            cooldown (float, optional): The first cooldown of a throttled account in seconds. Default is 300.
+            max_cooldown (float, optional): The longest cooldown in seconds. Default is 3600.
+        """
+
+        self.requests_per_minute = requests_per_minute
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.accounts: Dict[str, PooledAccount] = {}
+        self.writer_username: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def add_account(
+            self,
+            username: str,
+            password: str,
+            token_path: Optional[str] = None,
+            settings_file: Optional[str] = None,
+            requests_per_minute: Optional[float] = None,
+            **kwargs
+    ) -> PooledAccount:
+        """
+        Add an account to the pool. The first account added becomes the writer.
+
+        Parameters:
+            username (str): The username of the account.
+            password (str): The password of the account.
+            token_path (str, optional): The token file. Default is "<username>_threads_token.bin".
+            settings_file (str, optional): The settings file. Default is "<username>_settings.json".
+            requests_per_minute (float, optional): The request budget of this account. Default is the pool default.
+            **kwargs: Additional keyword arguments for ThreadsApi.
+
+        Returns:
+            PooledAccount: The pooled account.
+        """
+
+        api = ThreadsApi(
+            username=username,
+            password=password,
+            token_path=token_path or f"{username}_threads_token.bin",
+            settings_file=settings_file or f"{username}_settings.json",
+            **kwargs
+        )
+        account = PooledAccount(
+            username=username,
+            api=api,
+            limiter=RateLimiter(requests_per_minute or self.requests_per_minute, per=60),
+        )
+        with self._lock:
+            self.accounts[username] = account
+            if self.writer_username is None:
+                self.writer_username = username
+        return account
+
+    def login_all(self) -> Dict[str, bool]:
+        """
+        Log in every account that is not logged in yet. Accounts that fail to log in are left out of routing.
+
+        Returns:
+            Dict[str, bool]: The login result per username.
+        """
+
+        results = {}
+        for username, account in list(self.accounts.items()):
+            if account.api.is_logged_in:
+                results[username] = True
+                continue
+            try:
+                results[username] = account.api.login()
+            except ChallengeRequiredError:
+                account.challenged = True
+                results[username] = False
+            except Exception as exception:
+                print(f"Error: {exception}")
+                results[username] = False
+        return results
+
+    def pin_writer(self, username: str):
+        """
+        Choose the account that write actions are sent from.
+
+        Parameters:
+            username (str): The username of a pooled account.
+        """
+
+        if username not in self.accounts:
+            raise ValueError(f"Unknown account: {username}")
+        self.writer_username = username
+
+    @property
+    def writer(self) -> ThreadsApi:
+        """
+        Property to get the client of the pinned writer account.
+
+        Returns:
+            ThreadsApi: The writer client.
+        """
+
+        if self.writer_username is None:
+            raise Exception("No accounts in the pool")
+        return self.accounts[self.writer_username].api
+
+    def reset(self, username: str):
+        """
+        Put an account back into rotation after a challenge was solved or a cooldown should be cut short.
+        An account whose session expired is logged in again.
+
+        Parameters:
+            username (str): The username of a pooled account.
+        """
+
+        with self._lock:
+            account = self.accounts[username]
+            account.challenged = False
+            account.throttled = 0
+            account.cooldown_until = 0.0
+
+        if not account.api.is_logged_in:
+            account.api.login()
+
+    def _acquire(self, exclude: List[str]) -> PooledAccount:
+        """
+        Internal method to pick the least loaded healthy account and reserve a request slot on it.
+
+        Returns:
+            PooledAccount: The chosen account.
+        """
+
+        with self._lock:
+            candidates = [
+                account for account in self.accounts.values()
+                if account.healthy and account.username not in exclude
+            ]
+            if not candidates:
+                raise NoHealthyAccountError("No healthy account available in the pool")
+            account = min(candidates, key=lambda item: (item.in_flight, -item.limiter.available))
+            account.in_flight += 1
+        return account
+
+    def _release(self, account: PooledAccount, error: Optional[Exception] = None):
+        with self._lock:
+            account.in_flight -= 1
+            if isinstance(error, RateLimitedError):
+                account.cooldown_until = time.time() + min(self.max_cooldown, self.cooldown * 2 ** account.throttled)
+                account.throttled += 1
+            elif isinstance(error, ChallengeRequiredError):
+                account.challenged = True
+            elif isinstance(error, LoginRequiredError):
+                account.api.is_logged_in = False
+            elif error is None:
+                account.throttled = 0
+
+    def read(self, method: str, *args, **kwargs) -> Any:
+        """
+        Run a read method on the least loaded healthy account, moving to another account when one is throttled or challenged.
+
+        Parameters:
+            method (str): The ThreadsApi read method, e.g. "get_user_profile".
+            *args: The positional arguments for the method.
+            **kwargs: The keyword arguments for the method.
+
+        Returns:
+            The result of the method.
+        """
+
+        if method not in READ_METHODS:
+            raise ValueError(f"Not a read method: {method}")
+
+        tried = []
+        while True:
+            account = self._acquire(tried)
+            try:
+                account.limiter.acquire()
+                result = getattr(account.api, method)(*args, **kwargs)
+            except (RateLimitedError, ChallengeRequiredError, LoginRequiredError) as error:
+                self._release(account, error)
+                tried.append(account.username)
+                continue
+            except Exception:
+                self._release(account)
+                raise
+            self._release(account)
+            return result
+
+    def write(self, method: str, *args, **kwargs) -> Any:
+        """
+        Run a write method on the pinned writer account within its request budget.
+
+        Parameters:
+            method (str): The ThreadsApi write method, e.g. "follow_user".
+            *args: The positional arguments for the method.
+            **kwargs: The keyword arguments for the method.
+
+        Returns:
+            The result of the method.
+        """
+
+        if method not in WRITE_METHODS:
+            raise ValueError(f"Not a write method: {method}")
+
+        with self._lock:
+            if self.writer_username is None:
+                raise Exception("No accounts in the pool")
+            account = self.accounts[self.writer_username]
+            account.in_flight += 1
+
+        try:
+            account.limiter.acquire()
+            result = getattr(account.api, method)(*args, **kwargs)
+        except (RateLimitedError, ChallengeRequiredError, LoginRequiredError) as error:
+            self._release(account, error)
+            raise
+        except Exception:
+            self._release(account)
+            raise
+        self._release(account)
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        if name in READ_METHODS:
+            return lambda *args, **kwargs: self.read(name, *args, **kwargs)
+        if name in WRITE_METHODS:
+            return lambda *args, **kwargs: self.write(name, *args, **kwargs)
+        raise AttributeError(name)
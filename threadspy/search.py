@@ -0,0 +1,361 @@
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+from threadspy.utils import atomic_write
+
+TOKEN_PATTERN = re.compile(r'[#@]?\w+(?:\.\w+)*', re.UNICODE)
+QUERY_PATTERN = re.compile(r'"[^"]*"|\(|\)|-?[^\s()"]+')
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split caption text into lowercase index terms. Hashtags and @mentions keep their prefix.
+
+    Parameters:
+        text (str): The caption text.
+
+    Returns:
+        List[str]: The terms in order of appearance.
+    """
+
+    return [token.lower() for token in TOKEN_PATTERN.findall(text or '')]
+
+@dataclass
+class IndexedPost:
+    id: str
+    thread_id: Optional[str]
+    author: Optional[str]
+    taken_at: Optional[int]
+    text: str
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'thread_id': self.thread_id,
+            'author': self.author,
+            'taken_at': self.taken_at,
+            'text': self.text,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'IndexedPost':
+        return cls(
+            id=data['id'],
+            thread_id=data.get('thread_id'),
+            author=data.get('author'),
+            taken_at=data.get('taken_at'),
+            text=data.get('text', ''),
+        )
+
+class CaptionIndex:
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the CaptionIndex object.
+
+        The index maps every term to the posts and positions it appears at. When a path is
+        given, each indexed post is appended to it as a JSON line. The postings themselves
+        are saved to ``<path>.index`` on close() or save(), so the next start loads them
+        directly and only tokenizes the posts appended after the last save.
+
+        Parameters:
+            path (str, optional): The file to persist indexed posts to. Default is None (memory only).
+        """
+
+        self.path = path
+        self.posts: Dict[str, IndexedPost] = {}
+        self._postings: Dict[str, Dict[str, List[int]]] = {}
+        self._authors: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+        self._file = None
+        self._dirty = False
+
+        if path is not None:
+            offset = self._load_snapshot()
+            if os.path.exists(path):
+                with open(path, 'rb') as file:
+                    file.seek(offset)
+                    for line in file:
+                        if line.endswith(b'\n'):
+                            self._add(IndexedPost.from_dict(json.loads(line)))
+                            self._dirty = True
+            self._file = open(path, 'a', encoding='utf-8')
+
+    @property
+    def _snapshot_path(self) -> str:
+        return self.path + '.index'
+
+    def _load_snapshot(self) -> int:
+        """
+        Internal method to load the saved postings.
+
+        Returns:
+            int: The offset in the posts file up to which the snapshot is complete, 0 if there is none.
+        """
+
+        if not os.path.exists(self._snapshot_path):
+            return 0
+        with open(self._snapshot_path, 'r', encoding='utf-8') as file:
+            snapshot = json.load(file)
+
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if snapshot.get('offset', 0) > size:
+            # The posts file was replaced, rebuild from it instead
+            return 0
+
+        for row in snapshot['posts']:
+            post = IndexedPost(*row)
+            self.posts[post.id] = post
+            if post.author:
+                self._authors.setdefault(post.author.lower(), set()).add(post.id)
+        self._postings = snapshot['postings']
+        return snapshot['offset']
+
+    def save(self):
+        """
+        Save the postings next to the posts file so the next start does not re-tokenize them.
+        """
+
+        with self._lock:
+            if self.path is None or self._file is None or not self._dirty:
+                return
+            self._file.flush()
+            snapshot = {
+                'offset': os.path.getsize(self.path),
+                'posts': [
+                    [post.id, post.thread_id, post.author, post.taken_at, post.text]
+                    for post in self.posts.values()
+                ],
+                'postings': self._postings,
+            }
+            atomic_write(self._snapshot_path, json.dumps(snapshot, separators=(',', ':')).encode())
+            self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self.posts)
+
+    def __enter__(self) -> 'CaptionIndex':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Save the postings and close the backing file.
+        """
+
+        with self._lock:
+            self.save()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def flush(self):
+        """
+        Flush indexed posts to the backing file.
+        """
+
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def _add(self, post: IndexedPost):
+        self.posts[post.id] = post
+        for position, term in enumerate(tokenize(post.text)):
+            self._postings.setdefault(term, {}).setdefault(post.id, []).append(position)
+        if post.author:
+            self._authors.setdefault(post.author.lower(), set()).add(post.id)
+
+    def add_post(self, post, thread_id: Optional[str] = None) -> bool:
+        """
+        Index the caption of a Post. Posts that are already indexed or have no caption are skipped.
+
+        Parameters:
+            post (Post): The post to index.
+            thread_id (str, optional): The ID of the thread containing the post.
+
+        Returns:
+            bool: True if the post was added, False otherwise.
+        """
+
+        post_id = post.pk or post.id
+        if post_id is None or post.caption is None or not post.caption.text:
+            return False
+
+        entry = IndexedPost(
+            id=str(post_id),
+            thread_id=str(thread_id) if thread_id is not None else None,
+            author=post.user.username if post.user is not None else None,
+            taken_at=post.taken_at,
+            text=post.caption.text,
+        )
+        with self._lock:
+            if entry.id in self.posts:
+                return False
+            self._add(entry)
+            self._dirty = True
+            if self._file is not None:
+                self._file.write(json.dumps(entry.to_dict(), separators=(',', ':')) + '\n')
+        return True
+
+    def add_thread(self, thread) -> int:
+        """
+        Index every post of a Thread.
+
+        Parameters:
+            thread (Thread): The thread to index.
+
+        Returns:
+            int: The number of posts added.
+        """
+
+        posts = [item.post for item in (thread.thread_items or []) if item.post is not None]
+        posts += thread.posts or []
+        return sum(self.add_post(post, thread.id) for post in posts)
+
+    def add_threads(self, threads: Iterable) -> int:
+        """
+        Index every post of several Threads.
+
+        Parameters:
+            threads (Iterable[Thread]): The threads to index.
+
+        Returns:
+            int: The number of posts added.
+        """
+
+        return sum(self.add_thread(thread) for thread in threads)
+
+    def search(
+            self,
+            query: str,
+            author: Optional[str] = None,
+            since: Optional[int] = None,
+            until: Optional[int] = None,
+            limit: Optional[int] = None,
+    ) -> List[IndexedPost]:
+        """
+        Search indexed captions.
+
+        Terms are combined with AND unless separated by OR. A term prefixed with "-" or
+        NOT excludes posts, "double quotes" match a phrase and parentheses group terms.
+
+        Parameters:
+            query (str): The query, e.g. '#python ("type hints" OR @zuck) -java'.
+            author (str, optional): Only match posts by this username.
+            since (int, optional): Only match posts taken at or after this timestamp.
+            until (int, optional): Only match posts taken at or before this timestamp.
+            limit (int, optional): The maximum number of results.
+
+        Returns:
+            List[IndexedPost]: The matching posts, newest first.
+        """
+
+        with self._lock:
+            tokens = QUERY_PATTERN.findall(query)
+            if tokens:
+                parser = _QueryParser(self, tokens)
+                matches = parser.parse()
+            else:
+                matches = set(self.posts)
+
+            if author is not None:
+                matches &= self._authors.get(author.lower(), set())
+
+            results = [self.posts[post_id] for post_id in matches]
+
+        if since is not None:
+            results = [post for post in results if post.taken_at is not None and post.taken_at >= since]
+        if until is not None:
+            results = [post for post in results if post.taken_at is not None and post.taken_at <= until]
+
+        results.sort(key=lambda post: post.taken_at or 0, reverse=True)
+        return results[:limit] if limit is not None else results
+
+    def _term(self, term: str) -> Set[str]:
+        return set(self._postings.get(term, ()))
+
+    def _phrase(self, terms: List[str]) -> Set[str]:
+        if not terms:
+            return set()
+        postings = [self._postings.get(term, {}) for term in terms]
+        candidates = set.intersection(*(set(posting) for posting in postings))
+        matches = set()
+        for post_id in candidates:
+            starts = set(postings[0][post_id])
+            for offset, posting in enumerate(postings[1:], start=1):
+                starts &= {position - offset for position in posting[post_id]}
+                if not starts:
+                    break
+            if starts:
+                matches.add(post_id)
+        return matches
+
+class _QueryParser:
+    """
+    Recursive descent parser for search queries.
+
+        expression := and_group ("OR" and_group)*
+        and_group  := unary (["AND"] unary)*
+        unary      := ("NOT" | "-") unary | "(" expression ")" | phrase | term
+    """
+
+    def __init__(self, index: CaptionIndex, tokens: List[str]):
+        self.index = index
+        self.tokens = tokens
+        self.position = 0
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self) -> Optional[str]:
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def parse(self) -> Set[str]:
+        result = self._expression()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected token in query: {self._peek()}")
+        return result
+
+    def _expression(self) -> Set[str]:
+        result = self._and_group()
+        while self._peek() == 'OR':
+            self._next()
+            result = result | self._and_group()
+        return result
+
+    def _and_group(self) -> Set[str]:
+        result = self._unary()
+        while self._peek() not in (None, 'OR', ')'):
+            if self._peek() == 'AND':
+                self._next()
+            result = result & self._unary()
+        return result
+
+    def _unary(self) -> Set[str]:
+        token = self._next()
+        if token is None:
+            raise ValueError("Unexpected end of query")
+        if token in ('NOT', '-'):
+            return set(self.index.posts) - self._unary()
+        if token.startswith('-') and len(token) > 1:
+            self.position -= 1
+            self.tokens[self.position] = token[1:]
+            return set(self.index.posts) - self._unary()
+        if token == '(':
+            result = self._expression()
+            if self._next() != ')':
+                raise ValueError("Unbalanced parentheses in query")
+            return result
+        if token.startswith('"'):
+            return self.index._phrase(tokenize(token.strip('"')))
+
+        terms = tokenize(token)
+        if len(terms) == 1:
+            return self.index._term(terms[0])
+        return self.index._phrase(terms)
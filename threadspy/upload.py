@@ -0,0 +1,222 @@
+import io
+import mimetypes
+import os
+from typing import BinaryIO, Callable, Optional, Tuple, Union
+
+ImageSource = Union[str, bytes, bytearray, memoryview, BinaryIO]
+
+DEFAULT_MIME_TYPE = 'image/jpeg'
+
+class MemoryReader(io.RawIOBase):
+    """
+    Read-only file object over a bytes-like object. Reads return slices of the
+    original buffer, so nothing is copied until the bytes are sent.
+    """
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview]):
+        self._view = memoryview(data).cast('B')
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._view)}[whence]
+        self._position = max(0, min(len(self._view), base + offset))
+        return self._position
+
+    def read(self, size: int = -1) -> memoryview:
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._position + size)
+        chunk = self._view[self._position:end]
+        self._position = end
+        return chunk
+
+class UploadSource:
+    def __init__(
+            self,
+            stream: BinaryIO,
+            length: int,
+            mime_type: Optional[str] = None,
+            on_close: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Initialize the UploadSource object.
+
+        An upload body with a known length. requests sends it in blocks read from the
+        stream, so the whole image is never held in memory at once.
+
+        Parameters:
+            stream (BinaryIO): The stream positioned at the first byte to upload.
+            length (int): The number of bytes to upload.
+            mime_type (str, optional): The MIME type of the image. Default is "image/jpeg".
+            on_close (callable, optional): Called when the source is closed, e.g. to close a file it opened.
+        """
+
+        self.stream = stream
+        self.length = length
+        self.mime_type = mime_type or DEFAULT_MIME_TYPE
+        self._remaining = length
+        self._on_close = on_close
+        self._start = stream.tell() if _seekable(stream) else None
+        # The last chunk read from a stream that cannot seek, kept so it can be resent
+        self._retained: Optional[Tuple[int, bytes]] = None
+
+    def __len__(self) -> int:
+        # requests uses this as the Content-Length of the body
+        return self._remaining
+
+    def __enter__(self) -> 'UploadSource':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read the next block of the upload body.
+
+        Parameters:
+            size (int, optional): The maximum number of bytes. Default is the rest of the body.
+
+        Returns:
+            bytes: The block, empty at the end of the body.
+        """
+
+        size = self._remaining if size is None or size < 0 else min(size, self._remaining)
+        chunk = self.stream.read(size) if size else b''
+        self._remaining -= len(chunk)
+        return chunk
+
+    @property
+    def position(self) -> int:
+        """
+        Property to get the offset of the next byte to be read.
+
+        Returns:
+            int: The offset from the start of the body.
+        """
+
+        return self.length - self._remaining
+
+    def seekable(self) -> bool:
+        return self._start is not None
+
+    def chunk(self, offset: int, size: int, retain: bool = False) -> Union['ChunkReader', memoryview]:
+        """
+        Get the part of the body that starts at offset, e.g. to resume an upload.
+
+        Seekable sources are streamed from offset. Other sources can only move forward, so with
+        retain set each chunk is read into memory and kept until the next one, which lets a
+        failed chunk be resent from any offset inside it.
+
+        Parameters:
+            offset (int): The offset of the first byte.
+            size (int): The maximum number of bytes.
+            retain (bool, optional): If True, keep chunks of a stream that cannot seek. Default is False.
+
+        Returns:
+            ChunkReader or memoryview: The chunk. Its length may be shorter than size.
+
+        Raises:
+            ValueError: If the source cannot go back to offset.
+        """
+
+        if self._retained is not None:
+            start, data = self._retained
+            if start <= offset < start + len(data):
+                return memoryview(data)[offset - start:offset - start + size]
+
+        if offset != self.position:
+            if not self.seekable():
+                raise ValueError(f"Cannot resume the upload at offset {offset}")
+            self.stream.seek(self._start + offset)
+            self._remaining = self.length - offset
+
+        size = min(size, self._remaining)
+        if retain and not self.seekable():
+            data = bytearray()
+            while len(data) < size:
+                block = self.read(size - len(data))
+                if not block:
+                    break
+                data += block
+            self._retained = (offset, bytes(data))
+            return memoryview(self._retained[1])
+        return ChunkReader(self, size)
+
+    def close(self):
+        """
+        Release the underlying file, if the source opened it.
+        """
+
+        if self._on_close is not None:
+            self._on_close()
+            self._on_close = None
+
+class ChunkReader:
+    """
+    Reads at most a fixed number of bytes of an UploadSource, so one chunk can be sent as a request body.
+    """
+
+    def __init__(self, source: UploadSource, size: int):
+        self.source = source
+        self._remaining = size
+
+    def __len__(self) -> int:
+        return self._remaining
+
+    def read(self, size: int = -1) -> bytes:
+        size = self._remaining if size is None or size < 0 else min(size, self._remaining)
+        chunk = self.source.read(size) if size else b''
+        self._remaining -= len(chunk)
+        return chunk
+
+def _seekable(stream: BinaryIO) -> bool:
+    try:
+        return stream.seekable()
+    except (AttributeError, ValueError):
+        return False
+
+def _stream_length(stream: BinaryIO) -> int:
+    try:
+        return os.fstat(stream.fileno()).st_size - stream.tell()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        position = stream.tell()
+        end = stream.seek(0, io.SEEK_END)
+        stream.seek(position)
+        return end - position
+
+def open_upload_source(image: ImageSource) -> UploadSource:
+    """
+    Open a local image for a streaming upload.
+
+    Parameters:
+        image (str, bytes, bytearray, memoryview or file object): A file path, the image bytes, or
+            a binary file object positioned at the start of the image.
+
+    Returns:
+        UploadSource: The upload body.
+    """
+
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        reader = MemoryReader(image)
+        length = reader.seek(0, io.SEEK_END)
+        reader.seek(0)
+        return UploadSource(reader, length)
+
+    if hasattr(image, 'read'):
+        name = getattr(image, 'name', None)
+        mime_type = mimetypes.guess_type(name)[0] if isinstance(name, str) else None
+        return UploadSource(image, _stream_length(image), mime_type)
+
+    if isinstance(image, str) and os.path.isfile(image):
+        file = open(image, 'rb')
+        return UploadSource(file, os.fstat(file.fileno()).st_size, mimetypes.guess_type(image)[0], file.close)
+
+    raise ValueError('Wrong Image URL provided.')
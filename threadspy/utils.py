@@ -1,4 +1,10 @@
-from typing import Any
+from dataclasses import fields, is_dataclass
+from typing import Any, Iterator, Optional, Tuple
+import os
+import tempfile
+from contextlib import contextmanager
+import threading
+import time
 
 def get_default_headers() -> dict:
     return {
@@ -26,8 +32,213 @@ def get_default_headers() -> dict:
         'X-IG-App-ID': '238260118697367',
     }
 
+def atomic_write(path: str, data: bytes):
+    """
+    Write a file atomically by writing a temporary file next to it and renaming it into place.
+
+    Parameters:
+        path (str): The destination path.
+        data (bytes): The file content.
+    """
+
+    directory = os.path.dirname(os.path.abspath(path))
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(file_descriptor, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def model_to_dict(obj: Any) -> Any:
+    """
+    Convert a model (or list of models) to plain data, leaving out None values, empty lists and private fields.
+
+    Parameters:
+        obj (Any): The model, list or value to convert.
+
+    Returns:
+        Any: JSON serializable data using the same keys as the API responses.
+    """
+
+    if is_dataclass(obj) and not isinstance(obj, type):
+        data = {}
+        for item in fields(obj):
+            if item.name.startswith('_'):
+                continue
+            value = model_to_dict(getattr(obj, item.name))
+            if value is not None and value != []:
+                data[item.name] = value
+        return data
+    if isinstance(obj, (list, tuple)):
+        return [model_to_dict(item) for item in obj]
+    if isinstance(obj, dict):
+        return {key: model_to_dict(value) for key, value in obj.items()}
+    return obj
+
+def file_version(path: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Get a cheap fingerprint of a file that changes whenever it is rewritten or replaced.
+
+    Parameters:
+        path (str): The file path.
+
+    Returns:
+        tuple or None: The (inode, mtime in ns, size) of the file, or None if it does not exist.
+    """
+
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+@contextmanager
+def file_lock(path: str, shared: bool = False) -> Iterator[None]:
+    """
+    Hold an advisory lock on ``<path>.lock`` to coordinate with other processes.
+
+    Parameters:
+        path (str): The path of the file to protect.
+        shared (bool, optional): If True, take a shared (read) lock where supported. Default is False.
+    """
+
+    lock_file = open(path + '.lock', 'a+b')
+    try:
+        if os.name == 'nt':
+            import msvcrt
+
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    finally:
+        lock_file.close()
+
 def populate_if_available(cls: Any, data: dict, key: str,threads_client = None) -> Any:
     if data.get(key) is not None:
         return cls.from_dict(data[key]) if threads_client is None else cls.from_dict(data[key],threads_client)
     else:
         return None
+
+
+TRACKED_PROFILE_FIELDS = ('follower_count', 'biography', 'is_verified', 'bio_links')
+
+def profile_snapshot(user: Any, fields: Tuple[str, ...] = TRACKED_PROFILE_FIELDS) -> dict:
+    """
+    Build a plain, comparable snapshot of selected ThreadsUser fields.
+
+    Parameters:
+        user (ThreadsUser): The user to snapshot.
+        fields (tuple, optional): The attribute names to include.
+
+    Returns:
+        dict: The field values, with bio links flattened to a list of URLs.
+    """
+
+    snapshot = {}
+    for field in fields:
+        value = getattr(user, field, None)
+        if field == 'bio_links' and value is not None:
+            value = [link.url for link in value]
+        snapshot[field] = value
+    return snapshot
+
+class RateLimiter:
+    """
+    Thread-safe token bucket used to keep a request budget.
+
+    Tokens refill continuously at ``rate`` per ``per`` seconds up to ``burst``.
+    With the default burst of one, acquisitions are spread evenly over time.
+    """
+
+    def __init__(self, rate: float, per: float = 1.0, burst: Optional[float] = None):
+        """
+        Initialize the RateLimiter object.
+
+        Parameters:
+            rate (float): The number of tokens granted per period.
+            per (float, optional): The period in seconds. Default is 1.
+            burst (float, optional): The bucket capacity. Default is 1.
+        """
+
+        if rate <= 0 or per <= 0:
+            raise ValueError("rate and per must be positive")
+
+        self.rate = rate / per
+        self.burst = burst if burst is not None else 1.0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        """
+        Property to get the number of tokens currently available.
+
+        Returns:
+            float: The available tokens.
+        """
+
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def acquire(self, tokens: float = 1, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Take tokens from the bucket, waiting for them to refill if needed.
+
+        Parameters:
+            tokens (float, optional): The number of tokens to take. Default is 1.
+            blocking (bool, optional): If False, return immediately when tokens are missing.
+            timeout (float, optional): The maximum time to wait in seconds.
+
+        Returns:
+            bool: True if the tokens were taken, False otherwise.
+        """
+
+        if tokens > self.burst:
+            raise ValueError("Cannot acquire more tokens than the burst size")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+
+            if not blocking:
+                return False
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
@@ -0,0 +1,284 @@
+import heapq
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from threadspy.utils import RateLimiter, profile_snapshot
+
+@dataclass
+class WatchEvent:
+    type: str
+    user_id: int
+    data: Any
+    timestamp: float
+
+@dataclass
+class WatchedAccount:
+    user_id: int
+    interval: float
+    next_poll: float = 0.0
+    post_gap: Optional[float] = None
+    profile: Optional[dict] = None
+    seen_thread_ids: Set[str] = field(default_factory=set)
+    polls: int = 0
+    errors: int = 0
+
+class AccountWatcher:
+    NEW_THREAD = 'new_thread'
+    PROFILE_CHANGE = 'profile_change'
+
+    def __init__(
+            self,
+            threads_api,
+            requests_per_minute: float = 60,
+            min_interval: float = 60,
+            max_interval: float = 6 * 60 * 60,
+            jitter: float = 0.1,
+            backoff: float = 1.5,
+    ):
+        """
+        Initialize the AccountWatcher object.
+
+        Accounts are kept in a priority queue ordered by their next poll time. Each account
+        is polled at an interval derived from how often it posts: twice per expected post,
+        stretched by ``backoff`` whenever a poll finds nothing new.
+
+        Parameters:
+            threads_api (ThreadsApi): A logged in client used for polling.
+            requests_per_minute (float, optional): The global request budget. Default is 60.
+            min_interval (float, optional): The shortest poll interval in seconds. Default is 60.
+            max_interval (float, optional): The longest poll interval in seconds. Default is 6 hours.
+            jitter (float, optional): The relative random spread applied to each interval. Default is 0.1.
+            backoff (float, optional): The interval multiplier after a poll without changes. Default is 1.5.
+        """
+
+        self.threads_api = threads_api
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.backoff = backoff
+        self.limiter = RateLimiter(requests_per_minute, per=60)
+
+        self.accounts: Dict[int, WatchedAccount] = {}
+        self._callbacks: List[Callable[[WatchEvent], None]] = []
+        self._queue: list = []
+        self._counter = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_callback(self, callback: Callable[[WatchEvent], None]):
+        """
+        Register a callback that receives every WatchEvent.
+
+        Parameters:
+            callback (callable): The function to call with each event.
+        """
+
+        self._callbacks.append(callback)
+
+    def watch(self, user_id: int, interval: Optional[float] = None):
+        """
+        Start watching an account. The first poll is spread randomly over the first interval.
+
+        Parameters:
+            user_id (int): The user ID to watch.
+            interval (float, optional): The starting poll interval. Default is min_interval.
+        """
+
+        interval = self._clamp(interval if interval is not None else self.min_interval)
+        with self._lock:
+            if user_id in self.accounts:
+                return
+            account = WatchedAccount(user_id=user_id, interval=interval)
+            self.accounts[user_id] = account
+            self._schedule(account, time.time() + random.uniform(0, interval))
+        self._wakeup.set()
+
+    def unwatch(self, user_id: int):
+        """
+        Stop watching an account.
+
+        Parameters:
+            user_id (int): The user ID to stop watching.
+        """
+
+        with self._lock:
+            self.accounts.pop(user_id, None)
+
+    def poll_once(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Poll the most overdue account if one is due.
+
+        Parameters:
+            now (float, optional): The current timestamp. Default is time.time().
+
+        Returns:
+            float or None: The number of seconds until the next account is due, or None if nothing is watched.
+        """
+
+        now = time.time() if now is None else now
+        with self._lock:
+            account = self._pop_due(now)
+            if account is None:
+                return self._next_delay(now)
+
+        self.limiter.acquire()
+        events = self._poll(account)
+        with self._lock:
+            if account.user_id in self.accounts:
+                self._schedule(account, time.time() + self._jittered(account.interval))
+
+        for event in events:
+            self._dispatch(event)
+
+        with self._lock:
+            return self._next_delay(time.time())
+
+    def run(self):
+        """
+        Poll accounts until stop() is called.
+        """
+
+        self._stop.clear()
+        while not self._stop.is_set():
+            delay = self.poll_once()
+            self._wakeup.clear()
+            self._wakeup.wait(self.max_interval if delay is None else delay)
+
+    def start(self) -> threading.Thread:
+        """
+        Run the watcher in a background daemon thread.
+
+        Returns:
+            threading.Thread: The watcher thread.
+        """
+
+        self._thread = threading.Thread(target=self.run, name='threadspy-watcher', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        """
+        Stop the watcher and wait for the background thread to exit.
+        """
+
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _poll(self, account: WatchedAccount) -> List[WatchEvent]:
+        """
+        Internal method to fetch an account, diff it against the last poll and adapt its interval.
+
+        Returns:
+            List[WatchEvent]: The change events found by this poll.
+        """
+
+        events = []
+        try:
+            profile = profile_snapshot(self.threads_api.get_user_profile(account.user_id))
+            self.limiter.acquire()
+            threads = self.threads_api.get_user_threads_auth(account.user_id)
+        except Exception as exception:
+            print(f"Error: {exception}")
+            account.errors += 1
+            account.interval = self._clamp(account.interval * self.backoff)
+            return events
+
+        now = time.time()
+        first_poll = account.polls == 0
+        account.polls += 1
+        account.errors = 0
+
+        if not first_poll and profile != account.profile:
+            changes = {
+                key: (account.profile.get(key), value)
+                for key, value in profile.items()
+                if account.profile.get(key) != value
+            }
+            events.append(WatchEvent(self.PROFILE_CHANGE, account.user_id, changes, now))
+        account.profile = profile
+
+        new_threads = [thread for thread in threads if thread.id not in account.seen_thread_ids]
+        if not first_poll:
+            events.extend(WatchEvent(self.NEW_THREAD, account.user_id, thread, now) for thread in new_threads)
+        account.seen_thread_ids = {thread.id for thread in threads}
+
+        gap = self._estimate_post_gap(threads)
+        if gap is not None:
+            account.post_gap = gap if account.post_gap is None else 0.7 * account.post_gap + 0.3 * gap
+
+        target = account.post_gap / 2 if account.post_gap is not None else account.interval
+        if new_threads and not first_poll:
+            account.interval = self._clamp(target)
+        else:
+            account.interval = self._clamp(max(target, account.interval * self.backoff))
+
+        return events
+
+    @staticmethod
+    def _estimate_post_gap(threads: list) -> Optional[float]:
+        """
+        Internal method to estimate the average gap between posts from their timestamps.
+
+        Returns:
+            float or None: The gap in seconds, or None if there are fewer than two timestamps.
+        """
+
+        taken_at = sorted(
+            item.post.taken_at
+            for thread in threads
+            for item in (thread.thread_items or [])[:1]
+            if item.post is not None and item.post.taken_at
+        )
+        if len(taken_at) < 2:
+            return None
+        return (taken_at[-1] - taken_at[0]) / (len(taken_at) - 1)
+
+    def _dispatch(self, event: WatchEvent):
+        for callback in self._callbacks:
+            try:
+                callback(event)
+            except Exception as exception:
+                print(f"Error: {exception}")
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def _jittered(self, interval: float) -> float:
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _schedule(self, account: WatchedAccount, when: float):
+        account.next_poll = when
+        self._counter += 1
+        heapq.heappush(self._queue, (when, self._counter, account.user_id))
+
+    def _pop_due(self, now: float) -> Optional[WatchedAccount]:
+        while self._queue:
+            when, _, user_id = self._queue[0]
+            account = self.accounts.get(user_id)
+            if account is None or account.next_poll != when:
+                # Stale entry left behind by unwatch() or a reschedule
+                heapq.heappop(self._queue)
+                continue
+            if when > now:
+                return None
+            heapq.heappop(self._queue)
+            return account
+        return None
+
+    def _next_delay(self, now: float) -> Optional[float]:
+        while self._queue:
+            when, _, user_id = self._queue[0]
+            account = self.accounts.get(user_id)
+            if account is None or account.next_poll != when:
+                heapq.heappop(self._queue)
+                continue
+            return max(0.0, when - now)
+        return None
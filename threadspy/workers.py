@@ -0,0 +1,171 @@
+import json
+import zlib
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+from threadspy import models
+from threadspy.auth import SessionSnapshot
+from threadspy.client import ThreadsApi
+from threadspy.pool import READ_METHODS
+from threadspy.utils import model_to_dict
+
+# The client of the current worker process, created once by _init_worker
+_WORKER_API: Optional[ThreadsApi] = None
+
+def encode_payload(result: Any) -> bytes:
+    """
+    Serialize a ThreadsApi result into a compact, compressed payload.
+
+    Parameters:
+        result (Any): A model, a list of models or plain data.
+
+    Returns:
+        bytes: The payload.
+    """
+
+    sample = result[0] if isinstance(result, list) and result else result
+    payload = {
+        'type': type(sample).__name__ if hasattr(models, type(sample).__name__) else None,
+        'data': model_to_dict(result),
+    }
+    return zlib.compress(json.dumps(payload, separators=(',', ':')).encode())
+
+def decode_payload(payload: bytes, rebuild: bool = False, threads_client: Optional[ThreadsApi] = None) -> Any:
+    """
+    Deserialize a payload made by encode_payload.
+
+    Parameters:
+        payload (bytes): The payload.
+        rebuild (bool, optional): If True, rebuild model objects instead of returning plain data. Default is False.
+        threads_client (ThreadsApi, optional): The client attached to rebuilt models that support one.
+
+    Returns:
+        Any: The plain data, or the rebuilt models.
+    """
+
+    payload = json.loads(zlib.decompress(payload))
+    data = payload['data']
+    if not rebuild or payload['type'] is None:
+        return data
+
+    cls = getattr(models, payload['type'])
+
+    def build(item):
+        try:
+            return cls.from_dict(item, threads_client)
+        except TypeError:
+            return cls.from_dict(item)
+
+    return [build(item) for item in data] if isinstance(data, list) else build(data)
+
+def _init_worker(snapshot: dict):
+    global _WORKER_API
+    _WORKER_API = ThreadsApi.from_session(SessionSnapshot.from_dict(snapshot))
+
+def _run_job(method: str, args: tuple, kwargs: dict) -> bytes:
+    return encode_payload(getattr(_WORKER_API, method)(*args, **kwargs))
+
+class WorkerPool:
+    def __init__(
+            self,
+            snapshot: SessionSnapshot,
+            processes: Optional[int] = None,
+            mp_context=None,
+    ):
+        """
+        Initialize the WorkerPool object.
+
+        Every worker process builds its own ThreadsApi from the snapshot once, then runs
+        read jobs and sends back compressed JSON payloads instead of pickled models.
+
+        Parameters:
+            snapshot (SessionSnapshot): The session to share, from ThreadsApi.export_session.
+            processes (int, optional): The number of worker processes. Default is the number of CPUs.
+            mp_context (optional): The multiprocessing context to start workers with.
+        """
+
+        self.snapshot = snapshot
+        self.executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(snapshot.to_dict(),),
+        )
+
+    def __enter__(self) -> 'WorkerPool':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the worker processes.
+
+        Parameters:
+            wait (bool, optional): If True, wait for running jobs to finish. Default is True.
+        """
+
+        self.executor.shutdown(wait=wait)
+
+    def submit(self, method: str, *args, **kwargs) -> Future:
+        """
+        Schedule a read job.
+
+        Parameters:
+            method (str): The ThreadsApi read method, e.g. "get_thread".
+            *args: The positional arguments for the method.
+            **kwargs: The keyword arguments for the method.
+
+        Returns:
+            Future: A future resolving to the payload bytes, see decode_payload.
+        """
+
+        if method not in READ_METHODS:
+            raise ValueError(f"Not a read method: {method}")
+        return self.executor.submit(_run_job, method, args, kwargs)
+
+    def map(self, method: str, arguments: Iterable[Any], rebuild: bool = False, threads_client: Optional[ThreadsApi] = None) -> Iterator[Any]:
+        """
+        Run a read method for every argument and yield the results in order.
+
+        Parameters:
+            method (str): The ThreadsApi read method.
+            arguments (Iterable): One argument, or a tuple of arguments, per job.
+            rebuild (bool, optional): If True, yield model objects instead of plain data. Default is False.
+            threads_client (ThreadsApi, optional): The client attached to rebuilt models.
+
+        Returns:
+            Iterator[Any]: The decoded results.
+        """
+
+        futures = [self.submit(method, *self._as_args(argument)) for argument in arguments]
+        for future in futures:
+            yield decode_payload(future.result(), rebuild, threads_client)
+
+    def as_completed(self, method: str, arguments: Iterable[Any], rebuild: bool = False, threads_client: Optional[ThreadsApi] = None) -> Iterator[Tuple[Any, Any]]:
+        """
+        Run a read method for every argument and yield (argument, result) pairs as jobs finish.
+
+        Failed jobs yield their exception as the result.
+
+        Parameters:
+            method (str): The ThreadsApi read method.
+            arguments (Iterable): One argument, or a tuple of arguments, per job.
+            rebuild (bool, optional): If True, yield model objects instead of plain data. Default is False.
+            threads_client (ThreadsApi, optional): The client attached to rebuilt models.
+
+        Returns:
+            Iterator[Tuple[Any, Any]]: The argument and decoded result of each job.
+        """
+
+        futures = {self.submit(method, *self._as_args(argument)): argument for argument in arguments}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], decode_payload(future.result(), rebuild, threads_client)
+            except Exception as exception:
+                yield futures[future], exception
+
+    @staticmethod
+    def _as_args(argument: Any) -> tuple:
+        return argument if isinstance(argument, tuple) else (argument,)